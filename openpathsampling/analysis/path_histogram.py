@@ -2,7 +2,7 @@ import openpathsampling as paths
 from openpathsampling.numerics import SparseHistogram
 from openpathsampling.progress import SimpleProgress
 
-from collections import Counter
+from collections import Counter, defaultdict
 import numpy as np
 
 class VoxelInterpolator(object):
@@ -316,7 +316,7 @@ class PathHistogram(SimpleProgress, SparseHistogram):
         for (traj, w) in self.progress(list(zip(trajectories, weights))):
             # list so that progress can know the length
             self.add_trajectory(traj, w)
-        return self._histogram.copy()
+        return Counter(self._histogram)
 
     def add_trajectory(self, trajectory, weight=1.0):
         """Add a single trajectory to internal counter, with given weight
@@ -329,11 +329,11 @@ class PathHistogram(SimpleProgress, SparseHistogram):
             the weight of the trajectory. Default 1.0
         """
         local_hist = self.single_trajectory_counter(trajectory)
-        local_hist = Counter({k : local_hist[k] * weight
-                              for k in local_hist.keys()})
         if self._histogram is None:
-            self._histogram = Counter({})
-        self._histogram += local_hist
+            self._histogram = defaultdict(float)
+        for (k, v) in local_hist.items():
+            self._histogram[k] += v * weight
+        self._histogram_changed()
         self.count += weight
 
 
@@ -390,7 +390,7 @@ class PathDensityHistogram(PathHistogram):
             cv_traj = [cv(traj) for cv in self.cvs]
             self.add_trajectory(list(zip(*cv_traj)), w)
 
-        return self._histogram.copy()
+        return Counter(self._histogram)
 
     def map_to_float_bins(self, trajectory):
         """Map trajectory to the bin value, without rounding bin number.
@@ -29,6 +29,11 @@ class ReactiveFluxAnalysis(ShootingPointAnalysis):
         if steps is not None:
             self.analyze(steps)
 
+    def _analyze_batch(self, steps):
+        # there are no states to test: analyze each step on its own
+        for step in steps:
+            self.analyze_single_step(step)
+
     def analyze_single_step(self, step):
         """
         Adding a single step.
@@ -1,8 +1,10 @@
 import collections
+import hashlib
 import pandas as pd
 import numpy as np
 
 from openpathsampling.progress import SimpleProgress
+from openpathsampling.integration_tools import is_simtk_quantity_type
 
 try:
     from collections import abc
@@ -10,6 +12,19 @@ except ImportError:
     import collections as abc
 
 
+def _coordinate_hash(snapshot):
+    """Fixed-size digest of a snapshot's coordinates.
+
+    Reads the coordinate buffer directly (no ``tobytes()`` copy), and
+    gives a 16-byte key no matter how many atoms there are.
+    """
+    coordinates = snapshot.coordinates
+    if is_simtk_quantity_type(coordinates):
+        coordinates = coordinates._value
+    coordinates = np.ascontiguousarray(coordinates)
+    return hashlib.blake2b(coordinates, digest_size=16).digest()
+
+
 # based on http://stackoverflow.com/a/3387975
 class TransformedDict(abc.MutableMapping):
     """A dictionary that applies an arbitrary key-altering function before
@@ -59,9 +74,17 @@ class TransformedDict(abc.MutableMapping):
         velocities, the resulting mapping would be invalid. It is up to the
         user to avoid such invalid remappings.
         """
-        return TransformedDict(new_hash,
-                               {self.hash_representatives[k]: self.store[k]
-                                for k in self.store})
+        rehashed = TransformedDict(new_hash)
+        # fill directly: one new_hash call per entry, no intermediate dict
+        # (same result as setting each representative's value in turn)
+        new_store = rehashed.store
+        new_representatives = rehashed.hash_representatives
+        for (hashed, representative) in self.hash_representatives.items():
+            new_hashed = new_hash(representative)
+            if new_hashed not in new_representatives:
+                new_representatives[new_hashed] = representative
+            new_store[new_hashed] = self.store[hashed]
+        return rehashed
 
 
 class SnapshotByCoordinateDict(TransformedDict):
@@ -71,8 +94,7 @@ class SnapshotByCoordinateDict(TransformedDict):
     (e.g., committor analysis).
     """
     def __init__(self, *args, **kwargs):
-        hash_fcn = lambda x: x.coordinates.tobytes()
-        super(SnapshotByCoordinateDict, self).__init__(hash_fcn,
+        super(SnapshotByCoordinateDict, self).__init__(_coordinate_hash,
                                                        *args, **kwargs)
 
 
@@ -91,64 +113,164 @@ class ShootingPointAnalysis(SimpleProgress, SnapshotByCoordinateDict):
     states : list of :class:`.Volume`
         volumes to consider as states for the analysis. For pandas output,
         these volumes must be named.
+    batch_size : int
+        number of steps whose test points are checked against the states
+        together (see :meth:`.analyze`)
     """
-    def __init__(self, steps, states):
+    def __init__(self, steps, states, batch_size=1000):
         super(ShootingPointAnalysis, self).__init__()
         self.states = states
         if steps is not None:
-            self.analyze(steps)
+            self.analyze(steps, batch_size)
 
-    def analyze(self, steps):
+    def analyze(self, steps, batch_size=1000):
         """Analyze a list of steps, adding to internal results.
 
         Parameters
         ----------
         steps : iterable of :class:`.MCStep` or None
             MC steps to analyze
+        batch_size : int
+            number of steps whose test points are checked against the
+            states together, with one :meth:`.Volume.contains_all` call per
+            state. Larger batches mean fewer (e.g., MDTraj) CV calls, but
+            keep more snapshots in memory at once.
         """
+        batch = []
         for step in self.progress(steps):
-            self.analyze_single_step(step)
+            batch.append(step)
+            if len(batch) == batch_size:
+                self._analyze_batch(batch)
+                batch = []
+        self._analyze_batch(batch)
+
+    def _analyze_batch(self, steps):
+        """Analyze several steps, testing all their points together."""
+        keys_and_points = [self._key_and_test_points(step)
+                           for step in steps]
+        test_points = [pt for (_, points) in keys_and_points
+                       for pt in points]
+        membership = self._state_membership(test_points)
+        start = 0
+        for (key, points) in keys_and_points:
+            end = start + len(points)
+            self._add_membership(key, membership[start:end])
+            start = end
+
+    def _state_membership(self, test_points):
+        """Which states each of the test points is in.
 
-    def analyze_single_step(self, step):
+        Parameters
+        ----------
+        test_points : list of :class:`.Snapshot`
+            the snapshots to test
+
+        Returns
+        -------
+        np.array of bool
+            shape (len(test_points), len(self.states)); entry [i, j] is
+            True if test point i is in state j
         """
-        Analyzes final states from a path sampling step. Adds to internal
-        results.
+        membership = np.zeros((len(test_points), len(self.states)),
+                              dtype=bool)
+        # snapshots with different topologies can't be evaluated in the
+        # same (e.g., MDTraj) CV call, so test each topology separately
+        groups = collections.OrderedDict()
+        for (idx, point) in enumerate(test_points):
+            topology = getattr(point, 'topology', None)
+            groups.setdefault(id(topology), []).append(idx)
+
+        for indices in groups.values():
+            points = [test_points[idx] for idx in indices]
+            for (state_idx, state) in enumerate(self.states):
+                membership[indices, state_idx] = state.contains_all(points)
+
+        return membership
+
+    def _key_and_test_points(self, step):
+        """Shooting snapshot and the new trajectory endpoints for a step.
 
         Parameters
         ----------
         step : :class:`.MCStep`
-            the step to analyze and add to this analysis
+            the step to extract the shooting point and test points from
 
         Returns
         -------
-        list of :class:`.Volume`
-            the states which are identified as new final states from this
-            move
+        key : :class:`.Snapshot` or None
+            the shooting snapshot (see :meth:`.step_key`)
+        test_points : list of :class:`.Snapshot`
+            endpoints of the trial trajectory that are not endpoints of the
+            initial trajectory; empty if key is None
         """
         key = self.step_key(step)
+        test_points = []
         if key is not None:
             details = step.change.canonical.details
             trial_traj = step.change.canonical.trials[0].trajectory
             init_traj = details.initial_trajectory
             test_points = [s for s in [trial_traj[0], trial_traj[-1]]
                            if s not in [init_traj[0], init_traj[-1]]]
+        return key, test_points
+
+    def analyze_single_step(self, step):
+        """
+        Analyzes final states from a path sampling step. Adds to internal
+        results.
+
+        Parameters
+        ----------
+        step : :class:`.MCStep`
+            the step to analyze and add to this analysis
+
+        Returns
+        -------
+        list of :class:`.Volume`
+            the states which are identified as new final states from this
+            move
+        """
+        (key, test_points) = self._key_and_test_points(step)
+        return self._add_membership(key,
+                                    self._state_membership(test_points))
 
-            total = collections.Counter(
-                {state: sum([int(state(pt)) for pt in test_points])
-                 for state in self.states}
-            )
+    def _add_membership(self, key, membership):
+        """Add results for a step, given the states of its test points.
+
+        Parameters
+        ----------
+        key : :class:`.Snapshot` or None
+            the shooting snapshot, from :meth:`._key_and_test_points`
+        membership : np.array of bool
+            state membership of the step's test points, as from
+            :meth:`._state_membership`
+
+        Returns
+        -------
+        list of :class:`.Volume`
+            as for :meth:`.analyze_single_step`
+        """
+        if key is not None:
+            counts = membership.sum(axis=0).tolist()
+            total = collections.Counter(dict(zip(self.states, counts)))
             total_count = sum(total.values())
             # TODO: clarify assertion (at least one endpoint in state)
             assert total_count == 1 or total_count == 2
-            try:
-                self[key] += total
-            except KeyError:
-                self[key] = total
+            self._add_counts(key, total)
         else:
             total = {}
 
         return [s for s in total.keys() if total[s] > 0]
 
+    def _add_counts(self, key, counts):
+        """Add counts (Counter of state to count) to the results for key"""
+        # hash the key once and merge in place; this is the hot path
+        hashed = self.hash_function(key)
+        try:
+            self.store[hashed].update(counts)
+        except KeyError:
+            self.hash_representatives[hashed] = key
+            self.store[hashed] = counts
+
     @staticmethod
     def step_key(step):
         """
@@ -196,11 +318,7 @@ class ShootingPointAnalysis(SimpleProgress, SnapshotByCoordinateDict):
         analyzer = ShootingPointAnalysis(None, states)
         for step in run_results:
             key = step[0]
-            total = collections.Counter({step[1]: 1})
-            try:
-                analyzer[key] += total
-            except KeyError:
-                analyzer[key] = total
+            analyzer._add_counts(key, collections.Counter({step[1]: 1}))
 
         return analyzer
 
@@ -226,14 +344,24 @@ class ShootingPointAnalysis(SimpleProgress, SnapshotByCoordinateDict):
         """
         if label_function is None:
             label_function = lambda s: s
-        results = {}
-        for k in self:
-            out_key = label_function(k)
-            counter_k = self[k]
-            committor = float(counter_k[state]) / sum([counter_k[s]
-                                                       for s in self.states])
-            results[out_key] = committor
-        return results
+        # last column is the target state; the others give the total
+        counts = self._count_matrix(list(self.states) + [state])
+        committors = counts[:, -1] / counts[:, :-1].sum(axis=1)
+        return {label_function(self.hash_representatives[k]): committor
+                for (k, committor) in zip(self.store, committors.tolist())}
+
+    def _count_matrix(self, states):
+        """Counts for each configuration as a (n_configurations, n_states)
+        array.
+
+        Rows are in the order of ``self.store``; columns are in the order
+        of the ``states`` parameter.
+        """
+        n_states = len(states)
+        counts = np.fromiter((counter[s] for counter in self.store.values()
+                              for s in states),
+                             dtype=np.int64, count=len(self.store) * n_states)
+        return counts.reshape(len(self.store), n_states)
 
     @staticmethod
     def _get_key_dim(key):
@@ -246,6 +374,59 @@ class ShootingPointAnalysis(SimpleProgress, SnapshotByCoordinateDict):
                                + "(key: {1})".format(ndim, key))
         return ndim
 
+    @staticmethod
+    def _histogram_bins(keys, bins):
+        """Flattened histogram bin for each key.
+
+        Bin edges follow the same conventions as numpy.histogram (1D) and
+        numpy.histogram2d (2D), including the inclusive last edge.
+
+        Parameters
+        ----------
+        keys : np.array
+            values to histogram, shape (n_keys, ndim)
+        bins : see numpy.histogram / numpy.histogram2d
+            bins input
+
+        Returns
+        -------
+        bin_idx : np.array
+            flattened (C-order) bin index for each key
+        in_range : np.array
+            boolean mask; False for keys outside the bins
+        shape : tuple of int
+            number of bins in each dimension
+        edges : list of np.array
+            the bin edges in each dimension
+        """
+        (n_keys, ndim) = keys.shape
+        if ndim == 1:
+            bins_per_dim = [bins]
+        else:
+            try:
+                n_bins_inputs = len(bins)
+            except TypeError:
+                n_bins_inputs = 1
+            if n_bins_inputs == 2:
+                bins_per_dim = list(bins)
+            else:
+                bins_per_dim = [bins] * ndim
+
+        bin_idx = np.zeros(n_keys, dtype=np.intp)
+        in_range = np.ones(n_keys, dtype=bool)
+        shape = []
+        edges = []
+        for (values, dim_bins) in zip(keys.T, bins_per_dim):
+            dim_edges = np.histogram_bin_edges(values, dim_bins)
+            n_bins = len(dim_edges) - 1
+            idx = np.searchsorted(dim_edges, values, side='right') - 1
+            idx[values == dim_edges[-1]] = n_bins - 1  # last edge inclusive
+            in_range &= (idx >= 0) & (idx < n_bins)
+            bin_idx = bin_idx * n_bins + idx
+            shape.append(n_bins)
+            edges.append(dim_edges)
+        return bin_idx, in_range, tuple(shape), edges
+
     def committor_histogram(self, new_hash, state, bins=10):
         """Calculate the histogrammed version of the committor.
 
@@ -267,31 +448,23 @@ class ShootingPointAnalysis(SimpleProgress, SnapshotByCoordinateDict):
         """
         rehashed = self.rehash(new_hash)
         r_store = rehashed.store
-        count_all = {k: sum(r_store[k].values()) for k in r_store}
-        count_state = {k: r_store[k][state] for k in r_store}
-        ndim = self._get_key_dim(list(r_store.keys())[0])
-        if ndim == 1:
-            (all_hist, b) = np.histogram(list(count_all.keys()),
-                                         weights=list(count_all.values()),
-                                         bins=bins)
-            (state_hist, b) = np.histogram(list(count_state.keys()),
-                                           weights=list(count_state.values()),
-                                           bins=bins)
-            b_list = [b]
-        elif ndim == 2:
-            (all_hist, b_x, b_y) = np.histogram2d(
-                x=[k[0] for k in count_all],
-                y=[k[1] for k in count_all],
-                weights=list(count_all.values()),
-                bins=bins
-            )
-            (state_hist, b_x, b_y) = np.histogram2d(
-                x=[k[0] for k in count_state],
-                y=[k[1] for k in count_state],
-                weights=list(count_state.values()),
-                bins=bins
-            )
-            b_list = [b_x, b_y]
+        ndim = self._get_key_dim(next(iter(r_store)))
+        n_keys = len(r_store)
+        # one pass over the store for each array; numpy needs no lists
+        keys = np.array(list(r_store.keys()), dtype=float)
+        keys = keys.reshape(n_keys, ndim)
+        count_all = np.fromiter((sum(c.values()) for c in r_store.values()),
+                                dtype=float, count=n_keys)
+        count_state = np.fromiter((c[state] for c in r_store.values()),
+                                  dtype=float, count=n_keys)
+        # bin the keys once, then reduce with each set of weights
+        (bin_idx, in_range, shape, b_list) = self._histogram_bins(keys, bins)
+        all_hist = np.bincount(bin_idx[in_range],
+                               weights=count_all[in_range],
+                               minlength=int(np.prod(shape))).reshape(shape)
+        state_hist = np.bincount(bin_idx[in_range],
+                                 weights=count_state[in_range],
+                                 minlength=int(np.prod(shape))).reshape(shape)
         # if all_hist is 0, state_hist is NaN: ignore warning, return NaN
         with np.errstate(divide='ignore', invalid='ignore'):
             state_frac = np.true_divide(state_hist, all_hist)
@@ -306,13 +479,11 @@ class ShootingPointAnalysis(SimpleProgress, SnapshotByCoordinateDict):
         label_function : callable
             takes snapshot, returns index to use for pandas.DataFrame
         """
-        transposed = pd.DataFrame(self.store).transpose().to_dict()
-        df = pd.DataFrame(transposed)
-        df.columns = [s.name for s in transposed.keys()]
+        states = list(self.states)
         if label_function is None:
-            df.index = range(len(df.index))
+            index = range(len(self.store))
         else:
-            # TODO: is ordering guaranteed here?
-            df.index = [label_function(self.hash_representatives[k])
-                        for k in self.store]
-        return df
+            index = [label_function(self.hash_representatives[k])
+                     for k in self.store]
+        return pd.DataFrame(self._count_matrix(states), index=index,
+                            columns=[s.name for s in states])
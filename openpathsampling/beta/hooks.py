@@ -119,13 +119,17 @@ class StorageHook(PathSimulatorHook):
 
     def after_step(self, sim, step_number, step_info, state, results,
                    hook_state):
-        if self.storage is not None:
-            try:
-                self.storage.stash(results)
-            except AttributeError:
-                self.storage.save(results)
+        storage = self.storage
+        if storage is not None:
+            # stash (buffered until sync_all) where the storage supports it;
+            # looked up directly rather than by catching AttributeError on
+            # every step
+            save = getattr(storage, 'stash', None)
+            if save is None:
+                save = storage.save
+            save(results)
             if step_number % self.frequency == 0:
-                self.storage.sync_all()
+                storage.sync_all()
 
     def after_simulation(self, sim, hook_state):
         if self.storage is not None:
@@ -1,6 +1,11 @@
 import numpy as np
 from .shared import StaticContainerStore, StaticContainer, unmask_quantity
 from openpathsampling.netcdfplus import WeakLRUCache
+from openpathsampling.integration_tools import (
+    error_if_no_mdtraj, is_simtk_quantity_type
+)
+# the md property below takes the name md in this module
+from openpathsampling.integration_tools import md as mdtraj
 import openpathsampling as paths
 
 variables = ['statics']
@@ -109,11 +114,24 @@ def md(snapshot):
 
     Notes
     -----
-    Rather slow since the topology has to be made each time. Try to avoid
-    it. This will only work if the engine has an mdtraj_topology property.
+    A new mdtraj.Trajectory is made on each access, so avoid this in tight
+    loops. This will only work if the engine has an mdtraj_topology
+    property.
     """
     if snapshot.statics is not None:
-        return paths.Trajectory([snapshot]).to_mdtraj()
+        error_if_no_mdtraj("Converting to mdtraj")
+        # same result as paths.Trajectory([snapshot]).to_mdtraj(), without
+        # the one-frame trajectory; the engine holds the mdtraj topology.
+        # Copy the coordinates once: mdtraj methods (e.g., superpose) work
+        # in place, and must not change the snapshot
+        xyz = np.array(snapshot.xyz, dtype=np.float32)[np.newaxis]
+        traj = mdtraj.Trajectory(xyz, snapshot.engine.mdtraj_topology)
+        box_vectors = snapshot.box_vectors
+        if is_simtk_quantity_type(box_vectors):
+            box_vectors = box_vectors._value
+        if np.any(box_vectors):
+            traj.unitcell_vectors = np.asarray(box_vectors)[np.newaxis]
+        return traj
 
 
 @property
@@ -128,6 +128,8 @@ class NDArrayHandler(AttributeHandler):
     def __init__(self, type_info):
         super().__init__(type_info)
         self.dtype, self.shape = type_info
+        # resolve once, not on every (de)serialization
+        self._np_dtype = np.dtype(self.dtype)
         self.backend_type = 'ndarray'
         self.type_size = None  # TODO: change this based on dtype/shape
 
@@ -136,9 +138,11 @@ class NDArrayHandler(AttributeHandler):
         return parse_ndarray_type(type_str)
 
     def serialize(self, obj):
-        return obj.astype(dtype=self.dtype, copy=False).tobytes()
+        # asarray only copies if the dtype doesn't already match
+        return np.asarray(obj, dtype=self._np_dtype).tobytes()
 
     def deserialize(self, data, caches=None):
-        return np.frombuffer(data, dtype=self.dtype).reshape(self.shape)
+        # zero-copy: the array is a read-only view of the stored bytes
+        return np.frombuffer(data, dtype=self._np_dtype).reshape(self.shape)
 
 DEFAULT_HANDLERS = [NDArrayHandler, StandardHandler]
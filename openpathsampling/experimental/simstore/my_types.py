@@ -4,19 +4,28 @@ ndarray_re = re.compile(
     "ndarray\.(?P<dtype>[a-z0-9]+)(?P<shape>\([0-9\,\ ]+\))"
 )
 
+# type name -> result of parse_ndarray_type; schemas repeat type names
+_ndarray_type_cache = {}
+
 def parse_ndarray_type(type_name):
+    try:
+        return _ndarray_type_cache[type_name]
+    except KeyError:
+        pass
     m_ndarray = ndarray_re.match(type_name)
     if m_ndarray:
         dtype = getattr(np, m_ndarray.group('dtype'))
         shape = tuple(map(int, m_ndarray.group('shape')[1:-1].split(',')))
-        return dtype, shape
-    return None
+        result = dtype, shape
+    else:
+        result = None
+    _ndarray_type_cache[type_name] = result
+    return result
 
 # TODO: this needs to be set up in a way to make it extensible (without
 # editing core code)
 def backend_registration_type(type_name):
     backend_type = type_name
-    ndarray_info = parse_ndarray_type(type_name)
     if parse_ndarray_type(type_name):
         backend_type = 'ndarray'
     return backend_type
@@ -32,10 +32,18 @@ class GenericLazyLoader(object):
                                + get_uuid(self))
         return self._loaded_object
 
+    # Attributes that must never trigger a load. Our own attributes only
+    # reach __getattr__ if __init__ hasn't run (e.g., during unpickling),
+    # where loading would recurse forever. IPython's display machinery
+    # probes for the prefixed names on every autoprint.
+    _no_load_attrs = frozenset(['_loaded_object', 'storage', 'class_'])
+    _no_load_prefixes = ('_ipython_', '_repr_')
+
     def __getattr__(self, attr):
-        # apparently IPython pretty-printing looks for a bunch of
-        # attributes; this means we auto-load if we try to autoprint the
-        # repr in IPython (TODO)
+        if (attr in self._no_load_attrs
+                or attr.startswith(self._no_load_prefixes)
+                or (attr.startswith('__') and attr.endswith('__'))):
+            raise AttributeError(attr)
         return getattr(self.load(), attr)
 
     def __getitem__(self, item):
@@ -67,20 +75,26 @@ class ProxyObjectFactory(object):
         self.serialization_schema = serialization_schema
         self.lazy_classes = {}
 
+    def _lazy_class(self, cls):
+        try:
+            lazy_cls = self.lazy_classes[cls]
+        except KeyError:
+            lazy_cls = self.lazy_classes[cls] = make_lazy_class(cls)
+        return lazy_cls
+
     def make_lazy(self, cls, uuid):
-        if cls not in self.lazy_classes:
-            self.lazy_classes[cls] = make_lazy_class(cls)
-        return self.lazy_classes[cls](uuid=uuid,
-                                      class_=cls,
-                                      storage=self.storage)
+        return self._lazy_class(cls)(uuid, cls, self.storage)
 
     def make_all_lazies(self, lazies):
         # lazies is dict of {table_name: list_of_lazy_uuid_rows}
         all_lazies = {}
+        storage = self.storage
         for (table, lazy_uuid_rows) in lazies.items():
-            logger.debug("Making {} lazy proxies for objects in table '{}'"\
-                         .format(len(lazy_uuid_rows), table))
+            logger.debug("Making %d lazy proxies for objects in table '%s'",
+                         len(lazy_uuid_rows), table)
+            # class lookups once per table, not once per row
             cls = self.serialization_schema.table_to_info[table].cls
-            for row in lazy_uuid_rows:
-                all_lazies[row.uuid] = self.make_lazy(cls, row.uuid)
+            lazy_cls = self._lazy_class(cls)
+            all_lazies.update({row.uuid: lazy_cls(row.uuid, cls, storage)
+                               for row in lazy_uuid_rows})
         return all_lazies
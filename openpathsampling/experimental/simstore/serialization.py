@@ -3,6 +3,7 @@ from .my_types import parse_ndarray_type
 from . import serialization_helpers as serialization
 from . import attribute_handlers
 import json
+import keyword
 
 import logging
 logger = logging.getLogger(__name__)
@@ -12,10 +13,93 @@ def load_list_uuid(json_str, cache_list):
     uuid_list = json.loads(json_str)
     if uuid_list is None:
         return uuid_list
-    uuid_list = [serialization.decode_uuid(u) for u in uuid_list]
-    return [serialization.search_caches(uuid, cache_list)
-            for uuid in uuid_list]
-
+    # one pass over the list, with the module lookups hoisted out of it
+    decode_uuid = serialization.decode_uuid
+    search_caches = serialization.search_caches
+    return [search_caches(decode_uuid(u), cache_list) for u in uuid_list]
+
+
+def _specialized_make_dct(attribute_handlers):
+    """Compile a make_dct function for a fixed set of attribute handlers.
+
+    The generated function applies each handler directly (one line per
+    attribute), instead of looping over the handler dict for every row.
+
+    Parameters
+    ----------
+    attribute_handlers : dict
+        mapping of attribute name to handler, where each handler is called
+        as ``handler(value, cache_list)``
+
+    Returns
+    -------
+    callable :
+        function ``make_dct(table_dct, cache_list)``, which replaces each
+        handled attribute in ``table_dct`` and returns ``table_dct``
+    """
+    namespace = {}
+    code = ["def make_dct(table_dct, cache_list):"]
+    for (num, (attr, handler)) in enumerate(attribute_handlers.items()):
+        handler_name = "_handler_" + str(num)
+        namespace[handler_name] = handler
+        code.append("    table_dct[{attr!r}] = {handler}(table_dct[{attr!r}], "
+                    "cache_list)".format(attr=attr, handler=handler_name))
+    code.append("    return table_dct")
+    exec(compile("\n".join(code), "<make_dct>", "exec"), namespace)
+    return namespace['make_dct']
+
+
+def _specialized_serialize(entries, attribute_handlers, encoded=()):
+    """Compile the serialization function for a fixed table schema.
+
+    The generated function reads each attribute and applies its handler
+    directly (one line per attribute), instead of looping over the schema
+    entries and the handler dict for every object.
+
+    Parameters
+    ----------
+    entries : list of (str, str)
+        schema entries for the table, as (attribute, type name) pairs
+    attribute_handlers : dict
+        mapping of attribute name to handler, where each handler is called
+        as ``handler(value)``
+    encoded : collection of str
+        attributes whose handlers already return storage-ready values;
+        these skip the search for UUID objects in the handler's result
+
+    Returns
+    -------
+    callable :
+        function ``serialize(obj)``, which returns the storage-ready dict
+        for ``obj``, including its UUID
+    """
+    namespace = {'_getattr': getattr,
+                 '_get_uuid': serialization.get_uuid,
+                 '_replace_uuid': serialization.replace_uuid,
+                 '_identity': lambda x: x}
+    handler_names = {}
+    for (num, (attr, handler)) in enumerate(attribute_handlers.items()):
+        handler_names[attr] = "_handler_" + str(num)
+        namespace[handler_names[attr]] = handler
+
+    code = ["def serialize(obj):", "    return {"]
+    for (attr, type_name) in entries:
+        if attr.isidentifier() and not keyword.iskeyword(attr):
+            value = "obj." + attr
+        else:
+            value = "_getattr(obj, {attr!r})".format(attr=attr)
+        if attr in handler_names:
+            value = "{handler}({value})".format(handler=handler_names[attr],
+                                                value=value)
+            if attr not in encoded:
+                value = "_replace_uuid({value}, uuid_encoding=_identity)"\
+                        .format(value=value)
+        code.append("        {attr!r}: {value},".format(attr=attr,
+                                                        value=value))
+    code.append("        'uuid': _get_uuid(obj),")
+    code.append("    }")
+    exec(compile("\n".join(code), "<serialize>", "exec"), namespace)
+    return namespace['serialize']
 
 
 class SchemaDeserializer(object):
@@ -35,11 +119,7 @@ class SchemaDeserializer(object):
         self.cls = cls
         self.handler_factories = handlers
         self.attribute_handlers = self.init_attribute_handlers()
-
-    # TODO: move this external
-    # @staticmethod
-    # def make_numpy_handler(dtype, shape):
-        # return lambda data, _: np.fromstring(data, dtype=dtype).reshape(shape)
+        self._make_dct = None
 
     def get_handler_from_factories(self, type_name):
         for factory in self.handler_factories:
@@ -55,19 +135,16 @@ class SchemaDeserializer(object):
                 handler = self.default_handlers[type_name]
             else:
                 handler = self.get_handler_from_factories(type_name)
-                # as_ndarray = parse_ndarray_type(type_name)
-                # if as_ndarray:
-                    # (dtype, shape) = as_ndarray
-                    # handler = self.make_numpy_handler(dtype, shape)
             if handler:
                 attribute_handlers[attr] = handler
         return attribute_handlers
 
     def make_dct(self, table_dct, cache_list):
-        for attr in self.attribute_handlers:
-            table_dct[attr] = self.attribute_handlers[attr](table_dct[attr],
-                                                            cache_list)
-        return table_dct
+        # handlers are fixed after init: compile a version specialized for
+        # them on first use
+        if self._make_dct is None:
+            self._make_dct = _specialized_make_dct(self.attribute_handlers)
+        return self._make_dct(table_dct, cache_list)
 
     def __call__(self, uuid, table_dct, cache_list):
         dct = self.make_dct(table_dct, cache_list)
@@ -84,7 +161,7 @@ class ToDictSerializer(SchemaDeserializer):
         'lazy': serialization.get_uuid,
         'json': serialization.to_bare_json,
         'json_obj': serialization.to_json_obj,
-        'list_uuid': serialization.to_bare_json
+        'list_uuid': serialization.to_uuid_list_json
     }
 
     # TODO: I think this class can be basically remobed; need to transfer
@@ -107,13 +184,14 @@ class ToDictSerializer(SchemaDeserializer):
 
 
 class SchemaSerializer(ToDictSerializer):
+    def __init__(self, schema, table, cls, handlers):
+        super(SchemaSerializer, self).__init__(schema, table, cls, handlers)
+        # the default handlers return strings, with UUIDs already encoded
+        encoded = [attr for (attr, type_name) in self.entries
+                   if type_name in self.default_handlers]
+        self._serialize = _specialized_serialize(self.entries,
+                                                 self.attribute_handlers,
+                                                 encoded)
+
     def __call__(self, obj):
-        dct = {attr: getattr(obj, attr)
-               for (attr, type_name) in self.entries}
-        replace = {attr: handler(dct[attr])
-                   for (attr, handler) in self.attribute_handlers.items()}
-        replace = serialization.replace_uuid(replace,
-                                             uuid_encoding=lambda x: x)
-        dct.update(replace)
-        dct.update({'uuid': serialization.get_uuid(obj)})
-        return dct
+        return self._serialize(obj)
@@ -1,5 +1,6 @@
 import importlib
 import re
+import sys
 import json
 import networkx as nx
 import numpy as np
@@ -123,40 +124,35 @@ def get_all_uuids(initial_object, known_uuids=None, class_info=None):
         objects found in the search
     """
     known_uuids = tools.none_to_default(known_uuids, {})
-    objects = [initial_object]
     uuids = {}
-    # found_objs = collections.Counter()
-    while objects:
-        new_objects = []
-        objects = unique_objects(objects)
-        # print objects
-        # found_objs += collections.Counter(o.__class__.__name__)
-                                          # for o in objects)
-        for obj in objects:
-            # TODO: this might be slow; check performance
-            if isinstance(obj, GenericLazyLoader):
-                obj = obj.load()
-
-            # TODO: find a way to ensure that objects doesn't go over
-            # duplicates here; see lprofile of default_find_uuids to see how
-            # often abort due to being in cache in there, and whether we
-            # should move the skip in here instead (how expensive is
-            # info_from_instance?)
-            info = class_info.info_from_instance(obj) \
-                    if class_info else None
-            if info and info.find_uuids is not None:
-                find_uuids = info.find_uuids
-            else:
-                find_uuids = default_find_uuids
-
-            new_uuids, new_objs = find_uuids(obj=obj,
-                                             cache_list=[uuids, known_uuids])
-
-            uuids.update(new_uuids)
-            new_objects.extend(new_objs)
-
-        objects = new_objects
-    # print(found_objs)
+    # single breadth-first worklist; each UUID object is searched once
+    pending = collections.deque([initial_object])
+    while pending:
+        obj = pending.popleft()
+        if has_uuid(obj):
+            # skip known objects before loading proxies or looking up info
+            obj_uuid = get_uuid(obj)
+            if obj_uuid in uuids or obj_uuid in known_uuids:
+                continue
+        elif not (is_storage_mappable(obj) or is_storage_iterable(obj)):
+            continue  # can't contain UUID objects
+
+        # TODO: this might be slow; check performance
+        if isinstance(obj, GenericLazyLoader):
+            obj = obj.load()
+
+        info = class_info.info_from_instance(obj) if class_info else None
+        if info and info.find_uuids is not None:
+            find_uuids = info.find_uuids
+        else:
+            find_uuids = default_find_uuids
+
+        new_uuids, new_objs = find_uuids(obj=obj,
+                                         cache_list=[uuids, known_uuids])
+
+        uuids.update(new_uuids)
+        pending.extend(new_objs)
+
     return uuids
 
 
@@ -181,6 +177,10 @@ class SchemaFindUUIDs(object):
         return uuids, new_objects
 
 
+# exact types of values that never are or contain UUIDs / encoded UUIDs
+_scalar_types = frozenset([int, long, float, bool, type(None)])
+_uuid_free_types = _scalar_types | frozenset([str, unicode, bytes])
+
 # NOTE: this only need to find until the first UUID: iterables/mapping with
 # UUIDs aren't necessary here
 def replace_uuid(obj, uuid_encoding):
@@ -214,13 +214,17 @@ def replace_uuid(obj, uuid_encoding):
         same
     """
     # this is UUID => string
+    # fast exit for the usual leaf values (exact types; subclasses could
+    # carry a UUID)
+    if type(obj) in _uuid_free_types:
+        return obj
     replacement = obj
     # fast exit for string keys
     if tools.is_string(obj):
         return replacement
     if has_uuid(obj):
         replacement = uuid_encoding(get_uuid(obj))
-    elif is_mappable(obj):
+    elif is_storage_mappable(obj):
         replacement = {
             replace_uuid(k, uuid_encoding): replace_uuid(v, uuid_encoding)
             for (k, v) in replacement.items()
@@ -234,6 +238,11 @@ def replace_uuid(obj, uuid_encoding):
 
 def to_dict_with_uuids(obj):
     dct = obj.to_dict()
+    # fast path: a flat dict of plain values has nothing to replace, so
+    # skip rebuilding it
+    if all(type(key) in _uuid_free_types and type(value) in _uuid_free_types
+           for (key, value) in dct.items()):
+        return dct
     return replace_uuid(dct, uuid_encoding=encode_uuid)
 
 
@@ -246,17 +255,54 @@ def to_bare_json(obj):
     return json.dumps(replaced)
 
 
+def to_uuid_list_json(obj):
+    """JSON for a list of UUID objects (``list_uuid`` attributes).
+
+    Same result as :func:`.to_bare_json`, but encodes the elements directly
+    instead of walking the list with :func:`.replace_uuid`.
+    """
+    if obj is None:
+        return 'null'
+    return json.dumps([
+        encode_uuid(get_uuid(o)) if has_uuid(o)
+        else replace_uuid(o, uuid_encoding=encode_uuid)
+        for o in obj
+    ])
+
+
 # this should be made obsolete by custom_json stuff
+_json_obj_prefixes = {}
+
+def _json_obj_prefix(cls):
+    # the class entries are the same for every object of the class
+    try:
+        return _json_obj_prefixes[cls]
+    except KeyError:
+        prefix = '{"__module__": %s, "__class__": %s' % (
+            json.dumps(cls.__module__), json.dumps(cls.__name__)
+        )
+        _json_obj_prefixes[cls] = prefix
+        return prefix
+
+
 def to_json_obj(obj):
-    dct = to_dict_with_uuids(obj)
-    dct.update({'__module__': obj.__class__.__module__,
-                '__class__': obj.__class__.__name__})
-    return json.dumps(dct)
+    # splice the cached class entries onto the serialized object dict,
+    # instead of adding them to the dict and serializing them each time
+    body = json.dumps(to_dict_with_uuids(obj))
+    prefix = _json_obj_prefix(obj.__class__)
+    if body == '{}':
+        return prefix + '}'
+    return prefix + ', ' + body[1:]
 
 
 def do_import (module, thing):
     # TODO: this needs some error-checking
-    mod = importlib.import_module(module)
+    # already-imported modules come straight from sys.modules, skipping the
+    # import machinery (locks, hooks); the attribute lookup is not cached,
+    # so a class redefined in its module is still picked up
+    mod = sys.modules.get(module)
+    if mod is None:
+        mod = importlib.import_module(module)
     result = getattr(mod, thing)
     return result
 
@@ -321,6 +367,8 @@ def from_dict_with_uuids(obj, cache_list):
     object
         input object with UUID strings replaced by the actual objects
     """
+    if type(obj) in _scalar_types:
+        return obj
     replacement = obj
     if is_uuid_string(obj):
         # raises KeyError if object hasn't been visited
@@ -330,7 +378,7 @@ def from_dict_with_uuids(obj, cache_list):
     elif tools.is_string(obj):
         # fast exit for string keys
         return obj
-    elif is_mappable(obj):
+    elif is_storage_mappable(obj):
         replacement = {from_dict_with_uuids(k, cache_list): \
                        from_dict_with_uuids(v, cache_list)
                        for (k, v) in obj.items()}
@@ -352,14 +400,41 @@ def from_json_obj(uuid, table_row, cache_list):
     return obj
 
 
-def _uuids_from_table_row(table_row, schema_entries, allow_lazy=True):
+def _uuid_attrs_from_schema(schema_entries):
+    """Group the UUID-bearing attributes of a table by how they are read.
+
+    This is for internal use; not to be part of the API.
+
+    Parameters
+    ----------
+    schema_entries : list of 2-tuple
+        the pairs of (attribute_name, attribute_type) for a table
+
+    Returns
+    -------
+    tuple of (list, list, list)
+        names of attributes holding a single UUID ('uuid'), holding JSON
+        text to scan for UUIDs ('list_uuid', 'json_obj'), and holding a
+        UUID to lazy-load ('lazy'). Other attributes are dropped.
+    """
+    uuid_attrs = [attr for (attr, attr_type) in schema_entries
+                  if attr_type == 'uuid']
+    scan_attrs = [attr for (attr, attr_type) in schema_entries
+                  if attr_type in ('list_uuid', 'json_obj')]
+    lazy_attrs = [attr for (attr, attr_type) in schema_entries
+                  if attr_type == 'lazy']
+    return uuid_attrs, scan_attrs, lazy_attrs
+
+
+def _uuids_from_table_row(table_row, schema_entries, allow_lazy=True,
+                          uuid_attrs=None):
     """Gather UUIDs from a table row (as provided by storage).
 
     This organizes the UUIDS that are included in the table row based on
     information from that row. It separated objects to be proxied ('lazy')
     from objects to be directly loaded ('uuid', 'list_uuid', 'json_obj').
-    It also create the dependency dictionary (the entry for this row) that
-    will be used to create the reconstruction DAG.
+    It also creates the dependencies of this row, which are used to create
+    the reconstruction DAG.
 
     This is for internal use; not to be part of the API.
 
@@ -372,6 +447,11 @@ def _uuids_from_table_row(table_row, schema_entries, allow_lazy=True):
         the pairs of (attribute_name, attribute_type) describing the columns
         from the ``table_row``. Should match the schema entry for the table
         that the table row comes from.
+    allow_lazy : bool
+        if False, 'lazy' attributes are fully loaded instead of proxied
+    uuid_attrs : tuple of (list, list, list)
+        result of :func:`._uuid_attrs_from_schema` for ``schema_entries``;
+        pass this to avoid regrouping the entries for every row of a table
 
     Returns
     -------
@@ -379,37 +459,32 @@ def _uuids_from_table_row(table_row, schema_entries, allow_lazy=True):
         list of UUIDs to be fully loaded
     lazy : set
         set of UUIDs to a lazy-loaded (i.e., as proxy)
-    dependencies : dict
-        length 1 dict mapping the input row's UUID to all UUIDs that it
-        directly depends on (i.e., everything from ``uuid`` and ``lazy``).
+    dependencies : set
+        all UUIDs that the input row directly depends on (i.e., everything
+        from ``uuid`` and ``lazy``); the caller maps ``table_row.uuid`` to
+        this
     """
     # take the schema entries here, not the whole schema
+    if uuid_attrs is None:
+        uuid_attrs = _uuid_attrs_from_schema(schema_entries)
+    single_attrs, scan_attrs, lazy_attrs = uuid_attrs
     uuid = set([])
     lazy = set([]) if allow_lazy else uuid
-    for (attr, attr_type) in schema_entries:
-        if attr_type == 'uuid':
-            uuid.add(getattr(table_row, attr))
-        elif attr_type == 'list_uuid':
-            # TODO: better to use encoded_uuid_re here?
-            uuid_list = json.loads(getattr(table_row, attr))
-            if uuid_list:
-                # skip if None (or empty)
-                uuid_list = {decode_uuid(u) for u in uuid_list}
-                uuid.update(uuid_list)
-        elif attr_type == 'json_obj':
-            json_dct = getattr(table_row, attr)
-            new_uuids = set(encoded_uuid_re.findall(json_dct))
-            uuid.update(new_uuids)
-        elif attr_type == 'lazy':
-            lazy.add(getattr(table_row, attr))
-        # other cases aren't UUIDs and are ignored
+    for attr in single_attrs:
+        uuid.add(getattr(table_row, attr))
+    for attr in scan_attrs:
+        # scan the JSON string directly instead of parsing it; a null
+        # (None) or empty list has no matches
+        uuid.update(encoded_uuid_re.findall(getattr(table_row, attr)))
+    for attr in lazy_attrs:
+        lazy.add(getattr(table_row, attr))
 
     if lazy is uuid:
         lazy = set([])
     # remove all cases of None as a UUID to depend on
     # TODO: should None be in the UUID list even?
     # TODO: can we return the set here?
-    dependencies = {table_row.uuid: (uuid | lazy) - {None}}
+    dependencies = (uuid | lazy) - {None}
     return (list(uuid), lazy, dependencies)
 
 
@@ -450,28 +525,37 @@ def get_all_uuids_loading(uuid_list, backend, schema, existing_uuids=None,
     all_table_rows = []
     lazy = set([])
     dependencies = {}
-    while uuid_list:
-        new_uuids = {uuid for uuid in uuid_list if uuid not in known_uuids}
+    # each pass only loads and scans the rows found in the previous pass
+    new_uuids = set(uuid_list) - known_uuids
+    row_to_table_name = backend.uuid_row_to_table_name
+    table_uuid_attrs = {}  # table name -> _uuid_attrs_from_schema result
+    while new_uuids:
         uuid_rows = backend.load_uuids_table(new_uuids)
         new_table_rows = backend.load_table_data(uuid_rows)
-        uuid_to_table.update({r.uuid: backend.uuid_row_to_table_name(r)
-                              for r in uuid_rows})
+        uuid_to_table.update((r.uuid, row_to_table_name(r))
+                             for r in uuid_rows)
 
-        uuid_list = []
+        found_uuids = set([])
         for row in new_table_rows:
-            entries = schema[uuid_to_table[row.uuid]]
+            table = uuid_to_table[row.uuid]
+            try:
+                uuid_attrs = table_uuid_attrs[table]
+            except KeyError:
+                uuid_attrs = _uuid_attrs_from_schema(schema[table])
+                table_uuid_attrs[table] = uuid_attrs
             loc_uuid, loc_lazy, deps = _uuids_from_table_row(
                 table_row=row,
-                schema_entries=entries,
-                allow_lazy=allow_lazy
+                schema_entries=schema[table],
+                allow_lazy=allow_lazy,
+                uuid_attrs=uuid_attrs
             )
-            uuid_list += loc_uuid
+            found_uuids.update(loc_uuid)
             lazy.update(loc_lazy)
-            dependencies.update(deps)
+            dependencies[row.uuid] = deps
+            all_table_rows.append(row)
 
-        all_table_rows += new_table_rows
         known_uuids |= new_uuids
-        uuid_list = {uuid for uuid in uuid_list if uuid not in known_uuids}
+        new_uuids = found_uuids - known_uuids
 
     return (all_table_rows, lazy, dependencies, uuid_to_table)
 
@@ -498,16 +582,62 @@ def dependency_dag(dependent_uuids, dag=None):
         if to_nodes:
             dag.add_edges_from([(from_node, to_node)
                                 for to_node in to_nodes])
-    if not nx_dag.is_directed_acyclic_graph(dag):  # pragma: no cover
-        raise RuntimeError("Reconstruction DAG not acyclic?!?!")
+    # acyclicity is checked when the DAG is ordered (see dag_reload_order),
+    # so that growing a DAG incrementally doesn't re-traverse it each time
     return dag
 
 def dag_reload_order(dag):
-    return list(reversed(list(nx_dag.topological_sort(dag))))
+    # the topological sort fails on a cycle; no separate check needed
+    try:
+        order = list(nx_dag.topological_sort(dag))
+    except nx.NetworkXUnfeasible:
+        raise RuntimeError("Reconstruction DAG not acyclic?!?!")
+    return list(reversed(order))
 
 def get_reload_order(to_load, dependencies):
-    dag = dependency_dag(dependencies)
+    """Order UUIDs so that each object comes after everything it needs.
+
+    This uses Kahn's algorithm directly on the dependency dict, rather
+    than building a :class:`networkx.DiGraph` (see :func:`dependency_dag`).
+
+    Parameters
+    ----------
+    to_load : List
+        table rows to be loaded (must have a ``uuid`` attribute)
+    dependencies : Dict[str, Iterable[str]]
+        maps the UUID of an object to the UUIDs it depends on
+
+    Returns
+    -------
+    List[str]
+        UUIDs in reload order: rows that are not part of any dependency
+        come first, followed by the nodes of the dependency graph
+    """
+    # number of dependencies not yet in the order, for each node
+    n_waiting = {}
+    dependents = collections.defaultdict(list)
+    for (uuid, deps) in dependencies.items():
+        if deps:
+            n_waiting[uuid] = len(deps)
+            for dep in deps:
+                dependents[dep].append(uuid)
+    for dep in dependents:
+        n_waiting.setdefault(dep, 0)
+
+    ready = collections.deque(uuid for (uuid, n_deps) in n_waiting.items()
+                              if n_deps == 0)
+    graph_order = []
+    while ready:
+        uuid = ready.popleft()
+        graph_order.append(uuid)
+        for dependent in dependents.get(uuid, []):
+            n_waiting[dependent] -= 1
+            if n_waiting[dependent] == 0:
+                ready.append(dependent)
+
+    if len(graph_order) != len(n_waiting):
+        raise RuntimeError("Reconstruction DAG not acyclic?!?!")
+
     no_deps = {row.uuid for row in to_load}
-    no_deps.difference_update(set(dag.nodes))
-    ordered_uuids = list(no_deps) + dag_reload_order(dag)
-    return ordered_uuids
+    no_deps.difference_update(n_waiting)
+    return list(no_deps) + graph_order
@@ -122,15 +122,18 @@ class GeneralStorage(StorableNamedObject):
             self.register_schema(self.schema, class_info_list=[])
 
     def _load_missing_info_tables(self, table_to_class):
+        # class_info.tables builds a new list on each access; do it once
+        known_tables = set(self.class_info.tables)
         missing_info_tables = [tbl for tbl in self.schema
-                               if tbl not in self.class_info.tables]
+                               if tbl not in known_tables]
         n_missing = len(missing_info_tables)
         logger.info("Missing info from %d dynamically-registered tables",
                     n_missing)
         classes = [table_to_class[tbl] for tbl in missing_info_tables]
         self.register_from_tables(missing_info_tables, classes)
+        known_tables = set(self.class_info.tables)
         missing_info_tables = [tbl for tbl in self.schema
-                               if tbl not in self.class_info.tables]
+                               if tbl not in known_tables]
         logger.info("Successfully registered %d missing tables",
                     n_missing - len(missing_info_tables))
 
@@ -311,7 +314,9 @@ class GeneralStorage(StorableNamedObject):
             logger.debug("Storing %d objects to table %s",
                          len(by_table[table]), table)
             serialize = self.class_info[table].serializer
-            storables_list = [serialize(o) for o in by_table[table].values()]
+            with tools.gc_paused():
+                storables_list = [serialize(o)
+                                  for o in by_table[table].values()]
             self.backend.add_to_table(table, storables_list)
             # special handling for simulation objects
             if table == 'simulation_objects':
@@ -402,13 +407,14 @@ class GeneralStorage(StorableNamedObject):
         lazy_uuid_rows = self.backend.load_uuids_table(lazy_uuids)
         lazies = tools.group_by_function(lazy_uuid_rows,
                                          self.backend.uuid_row_to_table_name)
-        new_uuids = self.proxy_factory.make_all_lazies(lazies)
+        with tools.gc_paused():
+            new_uuids = self.proxy_factory.make_all_lazies(lazies)
 
-        # get order and deserialize
-        uuid_to_table_row = {r.uuid: r for r in to_load}
-        ordered_uuids = get_reload_order(to_load, dependencies)
-        new_uuids = self.deserialize_uuids(ordered_uuids, uuid_to_table,
-                                           uuid_to_table_row, new_uuids)
+            # get order and deserialize
+            uuid_to_table_row = {r.uuid: r for r in to_load}
+            ordered_uuids = get_reload_order(to_load, dependencies)
+            new_uuids = self.deserialize_uuids(ordered_uuids, uuid_to_table,
+                                               uuid_to_table_row, new_uuids)
 
         self.cache.update(new_uuids)
         results.update(new_uuids)
@@ -427,16 +433,25 @@ class GeneralStorage(StorableNamedObject):
         # TODO: remove this, replace with SerializationSchema
         logger.debug("Reconstructing from %d objects", len(ordered_uuids))
         new_uuids = tools.none_to_default(new_uuids, {})
+        cache = self.cache
+        caches = [new_uuids, cache]
+        # table name -> (attribute names, deserializer); looked up once per
+        # table instead of once per object
+        table_handlers = {}
         for uuid in ordered_uuids:
-            if uuid not in self.cache and uuid not in new_uuids:
+            if uuid not in cache and uuid not in new_uuids:
                 # is_in = [k for (k, v) in dependencies.items() if v==uuid]
                 table = uuid_to_table[uuid]
+                try:
+                    attrs, deserialize = table_handlers[table]
+                except KeyError:
+                    attrs = [attr for (attr, _) in self.schema[table]]
+                    deserialize = self.class_info[table].deserializer
+                    table_handlers[table] = (attrs, deserialize)
                 table_row = uuid_to_table_row[uuid]
                 table_dict = {attr: getattr(table_row, attr)
-                              for (attr, type_name) in self.schema[table]}
-                deserialize = self.class_info[table].deserializer
-                obj = deserialize(uuid, table_dict, [new_uuids, self.cache])
-                new_uuids[uuid] = obj
+                              for attr in attrs}
+                new_uuids[uuid] = deserialize(uuid, table_dict, caches)
         return new_uuids
 
     def sync(self):
@@ -1,8 +1,10 @@
 from .serialization import *
+from .serialization import _specialized_make_dct, _specialized_serialize
 from .proxy import *  # TODO: move this elsewhere
 import pytest
 
 from .serialization_helpers import get_uuid, default_find_uuids
+from .uuids import set_uuid
 from .test_utils import (LoadingStorageMock, all_objects, toy_uuid_maker,
                          MockUUIDObject, MockSimulationObject, MockBackend)
 
@@ -11,6 +13,13 @@ from . import class_info
 from .attribute_handlers import DEFAULT_HANDLERS
 
 
+def test_load_list_uuid():
+    caches = [{'1': 'one'}, {'2': 'two'}]
+    assert load_list_uuid('["UUID(2)", "UUID(1)"]', caches) == ['two', 'one']
+    assert load_list_uuid('[]', caches) == []
+    assert load_list_uuid('null', caches) is None
+
+
 class TestGenericLazyLoader(object):
     def setup(self):
         original_and_class = {
@@ -79,6 +88,21 @@ class TestGenericLazyLoader(object):
         assert proxy.normal_attr == original.normal_attr
         assert proxy._loaded_object == original
 
+    @pytest.mark.parametrize('attr', [
+        '_ipython_canary_method_should_not_exist_', '_repr_html_',
+        '__wrapped__'
+    ])
+    def test_getattr_no_load(self, attr):
+        proxy = self.proxies['normal']
+        with pytest.raises(AttributeError):
+            getattr(proxy, attr)
+        assert proxy._loaded_object is None
+
+    def test_getattr_before_init(self):
+        proxy = GenericLazyLoader.__new__(GenericLazyLoader)
+        with pytest.raises(AttributeError):
+            proxy.normal_attr
+
     def test_serialize_proxy(self):
         proxy = self.proxies['normal']
         original = self.originals['normal']
@@ -113,6 +137,23 @@ class TestProxyObjectFactory(object):
         assert proxy._loaded_object is None
         assert proxy.normal_attr == original.normal_attr
 
+    def test_make_lazy_list_subclass(self):
+        # list-based classes (like trajectories) must stay mixable with
+        # the lazy loader; __slots__ on it would cause a layout conflict
+        class MockListObject(list):
+            pass
+
+        original = MockListObject([1, 2, 3])
+        set_uuid(original, 12345)
+        storage = LoadingStorageMock({get_uuid(original): original})
+        factory = ProxyObjectFactory(storage, None)
+        proxy = factory.make_lazy(MockListObject, get_uuid(original))
+        assert isinstance(proxy, MockListObject)
+        assert proxy._loaded_object is None
+        assert list(iter(proxy)) == [1, 2, 3]
+        assert len(proxy) == 3
+        assert proxy[1] == 2
+
     def test_make_all_lazies(self):
         backend = MockBackend()
         obj = all_objects['obj']
@@ -140,3 +181,90 @@ class TestProxyObjectFactory(object):
         assert proxy._loaded_object is None
         assert proxy.obj_attr.normal_attr == 5
         assert proxy._loaded_object is not None
+
+
+def test_specialized_make_dct():
+    handlers = {'foo': lambda value, caches: value + caches[0],
+                "it's": lambda value, caches: value * 2}
+    make_dct = _specialized_make_dct(handlers)
+    dct = {'foo': 1, "it's": 'a', 'bar': 3}
+    result = make_dct(dct, [10])
+    assert result is dct
+    assert result == {'foo': 11, "it's": 'aa', 'bar': 3}
+    assert _specialized_make_dct({})(dct, []) == dct
+
+
+def test_schema_deserializer_make_dct():
+    schema = {'table': [('inner', 'uuid'), ('value', 'int')]}
+    inner = all_objects['int']
+    deserializer = SchemaDeserializer(schema, 'table', MockUUIDObject, [])
+    dct = deserializer.make_dct({'inner': get_uuid(inner), 'value': 5},
+                                [{get_uuid(inner): inner}])
+    assert dct == {'inner': inner, 'value': 5}
+
+    class Overridden(SchemaDeserializer):
+        def make_dct(self, table_dct, cache_list):
+            return {'overridden': True}
+
+    deserializer = Overridden(schema, 'table', MockUUIDObject, [])
+    assert deserializer.make_dct({}, []) == {'overridden': True}
+
+
+def test_specialized_serialize():
+    class Example(object):
+        pass
+
+    obj = Example()
+    obj.inner = all_objects['int']
+    obj.value = 5
+    setattr(obj, 'not-an-identifier', 'a')
+    set_uuid(obj, 12345)
+    entries = [('inner', 'uuid'), ('value', 'int'),
+               ('not-an-identifier', 'str')]
+    serialize = _specialized_serialize(entries, {'inner': get_uuid})
+    assert serialize(obj) == {'inner': get_uuid(all_objects['int']),
+                              'value': 5, 'not-an-identifier': 'a',
+                              'uuid': '12345'}
+    serialize = _specialized_serialize([], {})
+    assert serialize(obj) == {'uuid': '12345'}
+
+
+def test_specialized_serialize_descriptors():
+    # values are read with attribute access, not from obj.__dict__, so
+    # properties and class-level defaults are serialized too
+    class Example(object):
+        default = 'class-level'
+
+        def __init__(self):
+            self._value = 3
+
+        @property
+        def value(self):
+            return self._value * 2
+
+    obj = Example()
+    set_uuid(obj, 12345)
+    serialize = _specialized_serialize([('value', 'int'),
+                                        ('default', 'str')], {})
+    assert serialize(obj) == {'value': 6, 'default': 'class-level',
+                              'uuid': '12345'}
+
+
+def test_specialized_serialize_encoded():
+    class Example(object):
+        pass
+
+    obj = Example()
+    obj.inner = all_objects['int']
+    set_uuid(obj, 12345)
+    inner_uuid = get_uuid(all_objects['int'])
+    # handlers returning objects with UUIDs need those replaced, unless the
+    # attribute is marked as already encoded
+    as_list = lambda x: [x]
+    serialize = _specialized_serialize([('inner', 'custom')],
+                                       {'inner': as_list})
+    assert serialize(obj) == {'inner': [inner_uuid], 'uuid': '12345'}
+    serialize = _specialized_serialize([('inner', 'custom')],
+                                       {'inner': as_list}, ['inner'])
+    assert serialize(obj) == {'inner': [all_objects['int']],
+                              'uuid': '12345'}
@@ -1,3 +1,4 @@
+import gc
 import pytest
 
 from .tools import *
@@ -9,6 +10,21 @@ def test_none_to_default():
 def test_compare_sets():
     pytest.skip()
 
+@pytest.mark.parametrize('enabled', [True, False])
+def test_gc_paused(enabled):
+    was_enabled = gc.isenabled()
+    (gc.enable if enabled else gc.disable)()
+    try:
+        with gc_paused():
+            assert not gc.isenabled()
+        assert gc.isenabled() == enabled
+        with pytest.raises(RuntimeError):
+            with gc_paused():
+                raise RuntimeError()
+        assert gc.isenabled() == enabled
+    finally:
+        (gc.enable if was_enabled else gc.disable)()
+
 class TestGroupBy(object):
     def setup(self):
         pass
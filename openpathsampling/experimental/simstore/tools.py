@@ -1,5 +1,7 @@
 import itertools
 import collections
+import contextlib
+import gc
 from collections import abc
 from numpy import ndarray
 
@@ -153,3 +155,22 @@ def nested_update(original, update):
             original[k] = v
     return original
 
+
+
+@contextlib.contextmanager
+def gc_paused():
+    """Context manager to pause the cyclic garbage collector.
+
+    Bulk saving and loading allocate many container objects, each of which
+    counts toward the collector's thresholds, so GC passes run repeatedly
+    over objects that are all still alive. The previous state of the
+    collector is restored afterward; no collection is forced, the normal
+    thresholds take over again.
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
@@ -41,9 +41,10 @@ encoded_uuid_re = re.compile("UUID\((?P<uuid>[\-]?[0-9]+)\)")
 
 
 def is_uuid_string(obj):
+    # startswith/endswith avoid creating slices of every string checked
     return (
         isinstance(obj, (str, unicode))
-        and obj[:5] == 'UUID(' and obj[-1] == ')'
+        and obj.startswith('UUID(') and obj.endswith(')')
     )
 
 
@@ -48,9 +48,18 @@ def schema_from_entries(features, lazies):
     return schema
 
 
+_schema_cache = {}
+
 def schema_for_snapshot(snapshot):
-    return schema_from_entries(features=snapshot.__features__.classes,
-                               lazies=snapshot.__features__.lazy)
+    # features are fixed per snapshot class, so build each schema once
+    cls = snapshot.__class__
+    schema = _schema_cache.get(cls)
+    if schema is None:
+        schema = schema_from_entries(features=snapshot.__features__.classes,
+                                     lazies=snapshot.__features__.lazy)
+        _schema_cache[cls] = schema
+    # shallow copy so callers can replace entries without touching the cache
+    return dict(schema)
 
 
 def replace_schema_dimensions(schema, descriptor):
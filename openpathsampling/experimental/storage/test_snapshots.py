@@ -6,6 +6,7 @@ from openpathsampling.tests.test_helpers import make_1d_traj
 from ..simstore.serialization_helpers import get_uuid
 
 from .snapshots import *
+from . import snapshots
 
 SCHEMA = {
     'statics': [('coordinates', 'ndarray.float32({n_atoms},{n_spatial})'),
@@ -32,6 +33,14 @@ def test_schema_for_snapshot():
     snapshot = make_1d_traj([0.0])[0]
     assert schema_for_snapshot(snapshot) == TOY_SCHEMA
 
+def test_schema_for_snapshot_cached():
+    snapshot = make_1d_traj([0.0])[0]
+    schema = schema_for_snapshot(snapshot)
+    descriptor = frozenset([('n_atoms', 1), ('n_spatial', 1)])
+    replace_schema_dimensions(schema, descriptor)
+    assert schema_for_snapshot(snapshot) == TOY_SCHEMA
+    assert snapshot.__class__ in snapshots._schema_cache
+
 def test_replace_schema_dimensions():
     descriptor = frozenset([('n_atoms', 1000), ('n_spatial', 3),
                             ('class', 'FooSnapshot')])
@@ -1,8 +1,9 @@
+import collections
 import inspect
+import keyword
 import logging
 import weakref
 import uuid
-from types import MethodType
 
 import sys
 if sys.version_info > (3, ):
@@ -16,16 +17,28 @@ except AttributeError:
     getfullargspec = inspect.getargspec
 
 
+# the descendants cache is invalidated by __init_subclass__ (Python 3.6+)
+_CACHE_DESCENDANTS = hasattr(object, '__init_subclass__')
+
+
 class StorableObject(object):
     """Mixin that allows objects of the class to to be stored using netCDF+
 
     """
 
-    _weak_cache = weakref.WeakKeyDictionary()
-    _weak_index = 0
+    # id(obj) -> (weakref to obj, base class name); only filled while
+    # observing (see set_observer)
+    _observed = {}
+
+    # set in the class body of the classes that other storables derive
+    # from; base() is None for these
+    _storable_root = True
 
     _base = None
     _args = None
+    _args_set = None
+    # cls -> tuple of all subclasses; emptied whenever a subclass is made
+    _descendants_cache = {}
 
     observe_objects = False
 
@@ -53,6 +66,23 @@ class StorableObject(object):
     def __init__(self):
         self.__uuid__ = StorableObject.get_uuid()
 
+    def __init_subclass__(cls, **kwargs):
+        super(StorableObject, cls).__init_subclass__(**kwargs)
+        StorableObject._descendants_cache.clear()
+        # the base class only depends on the bases, so resolve it now. The
+        # args stay lazy: decorators may still replace __init__.
+        cls.base()
+
+    def _observing_init(self):
+        StorableObject._plain_init(self)
+        key = id(self)
+
+        def _forget(_, key=key):
+            StorableObject._observed.pop(key, None)
+
+        StorableObject._observed[key] = (weakref.ref(self, _forget),
+                                         self.base_cls_name)
+
     @staticmethod
     def set_observer(active):
         """
@@ -77,18 +107,14 @@ class StorableObject(object):
         if StorableObject.observe_objects is active:
             return
 
+        # swap __init__, so that there is no cost when not observing
         if active:
-            # activate and add __init__
-
-            def _init(self):
-                StorableObject._weak_cache[self] = StorableObject._weak_index
-                StorableObject._weak_index += 1
-
-            StorableObject.__init__ = MethodType(_init, None, StorableObject)
-            StorableObject.observe_objects = True
+            StorableObject.__init__ = StorableObject._observing_init
+        else:
+            StorableObject.__init__ = StorableObject._plain_init
+            StorableObject._observed.clear()
 
-        if not active:
-            del StorableObject.__init__
+        StorableObject.observe_objects = active
 
     @staticmethod
     def count_weaks():
@@ -104,13 +130,9 @@ class StorableObject(object):
             objects the integer number of objects still present
 
         """
-        summary = dict()
-        complete = list(StorableObject._weak_cache)
-        for obj in complete:
-            name = obj.base_cls_name
-            summary[name] = summary.get(name, 0) + 1
-
-        return summary
+        return dict(collections.Counter(
+            name for (_, name) in list(StorableObject._observed.values())
+        ))
 
     def idx(self, store):
         """
@@ -132,11 +154,15 @@ class StorableObject(object):
             the integer index for the object of it exists or `None` else
 
         """
-        if hasattr(store, 'index'):
-            return store.index.get(self, None)
-        else:
+        # one attribute lookup instead of hasattr followed by the access;
+        # index is an instance attribute, so this can't be cached per type
+        try:
+            index = store.index
+        except AttributeError:
             return store.idx(self)
 
+        return index.get(self, None)
+
     @property
     def cls(self):
         """
@@ -162,18 +188,21 @@ class StorableObject(object):
         type
             the base class
         """
-        if cls._base is None:
-            if cls is not StorableObject and cls is not StorableNamedObject:
-                if StorableObject in cls.__bases__ \
-                        or StorableNamedObject in cls.__bases__:
-                    cls._base = cls
-                else:
-                    if hasattr(cls.__base__, 'base'):
-                        cls._base = cls.__base__.base()
-                    else:
-                        cls._base = cls
-
-        return cls._base
+        # look in this class's own __dict__: an inherited _base could be
+        # wrong if this class derives directly from StorableObject
+        base = cls.__dict__.get('_base')
+        if base is None:
+            if cls.__dict__.get('_storable_root'):
+                return None
+            if any(b.__dict__.get('_storable_root') for b in cls.__bases__):
+                base = cls
+            elif hasattr(cls.__base__, 'base'):
+                base = cls.__base__.base()
+            else:
+                base = cls
+            cls._base = base
+
+        return base
 
     def __hash__(self):
         return self.__uuid__ & 1152921504606846975
@@ -227,8 +256,16 @@ class StorableObject(object):
         list of type
             list of subclasses of a storable object
         """
-        return cls.__subclasses__() + \
+        try:
+            return list(StorableObject._descendants_cache[cls])
+        except KeyError:
+            pass
+
+        descendants = cls.__subclasses__() + \
             [g for s in cls.__subclasses__() for g in s.descendants()]
+        if _CACHE_DESCENDANTS:
+            StorableObject._descendants_cache[cls] = tuple(descendants)
+        return descendants
 
     @staticmethod
     def objects():
@@ -259,11 +296,25 @@ class StorableObject(object):
             included.
 
         """
-        try:
-            args = getfullargspec(cls.__init__)
-        except TypeError:
-            return []
-        return args[0]
+        args = cls.__dict__.get('_args')
+        if args is None:
+            try:
+                args = getfullargspec(cls.__init__)[0]
+            except TypeError:
+                args = []
+            cls._args = args
+
+        return args
+
+    @classmethod
+    def _arg_set(cls):
+        # frozenset of args(), for membership tests in from_dict
+        arg_set = cls.__dict__.get('_args_set')
+        if arg_set is None:
+            arg_set = frozenset(cls.args())
+            cls._args_set = arg_set
+
+        return arg_set
 
     _excluded_attr = []
     _included_attr = []
@@ -283,19 +334,37 @@ class StorableObject(object):
             the dictionary representing the (immutable) state of the object
 
         """
-        excluded_keys = ['idx', 'json', 'identifier']
-        keys_to_store = {
-            key for key in self.__dict__
-            if key in self._included_attr or (
-                key not in excluded_keys and
-                key not in self._excluded_attr and
-                not (key.startswith('_') and self._exclude_private_attr)
-            )
-        }
+        (excluded, included) = self._to_dict_filter()
+        exclude_private = self._exclude_private_attr
         return {
-            key: self.__dict__[key] for key in keys_to_store
+            key: value for (key, value) in self.__dict__.items()
+            if key in included or (
+                key not in excluded and
+                not (exclude_private and key[:1] == '_')
+            )
         }
 
+    @classmethod
+    def _to_dict_filter(cls):
+        """Excluded and included attribute names used by :meth:`.to_dict`.
+
+        Built once per class (the attribute lists are class constants).
+
+        Returns
+        -------
+        excluded : frozenset of str
+            names never stored (unless also included)
+        included : frozenset of str
+            names always stored, even if private
+        """
+        key_filter = cls.__dict__.get('_to_dict_filter_cache')
+        if key_filter is None:
+            excluded = frozenset(['idx', 'json', 'identifier']
+                                 + list(cls._excluded_attr))
+            key_filter = (excluded, frozenset(cls._included_attr))
+            cls._to_dict_filter_cache = key_filter
+        return key_filter
+
     @classmethod
     def from_dict(cls, dct):
         """
@@ -315,18 +384,20 @@ class StorableObject(object):
             dct = {}
 
         if hasattr(cls, 'args'):
-            args = cls.args()
-            init_dct = {key: dct[key] for key in dct if key in args}
+            args = cls._arg_set()
+            init_dct = {}
+            non_init_dct = {}
+            for key, value in dct.items():
+                if key in args:
+                    init_dct[key] = value
+                else:
+                    non_init_dct[key] = value
             try:
                 obj = cls(**init_dct)
 
                 if cls._restore_non_initial_attr:
-                    non_init_dct = {
-                        key: dct[key] for key in dct if key not in args}
-
-                    if len(non_init_dct) > 0:
-                        for key, value in non_init_dct.items():
-                            setattr(obj, key, value)
+                    for key, value in non_init_dct.items():
+                        setattr(obj, key, value)
 
                 return obj
 
@@ -353,6 +424,9 @@ class StorableObject(object):
             return cls(**dct)
 
 
+StorableObject._plain_init = StorableObject.__init__
+
+
 class StorableNamedObject(StorableObject):
     """Mixin that allows an object to carry a .name property that can be saved
 
@@ -360,6 +434,7 @@ class StorableNamedObject(StorableObject):
     storage usually sets the name to empty if an object has not been named
     before. This means that you cannot name an object, after is has been saved.
     """
+    _storable_root = True
 
     def __init__(self):
         super(StorableNamedObject, self).__init__()
@@ -453,7 +528,30 @@ class StorableNamedObject(StorableObject):
 
 
 def create_to_dict(keys_to_store):
-    def to_dict(self):
-        return {key: getattr(self, key) for key in keys_to_store}
+    """
+    Create a `to_dict` method that stores the given attributes
+
+    The keys are fixed, so the method is compiled with each attribute read
+    written out, rather than looping over the keys on every call.
+
+    Parameters
+    ----------
+    keys_to_store : list of str
+        the names of the attributes to store
+
+    Returns
+    -------
+    function
+        the `to_dict(self)` method
+    """
+    items = []
+    for key in keys_to_store:
+        if key.isidentifier() and not keyword.iskeyword(key):
+            items.append('%r: self.%s' % (key, key))
+        else:
+            items.append('%r: _getattr(self, %r)' % (key, key))
 
-    return to_dict
+    source = 'def to_dict(self):\n    return {%s}' % ', '.join(items)
+    namespace = {'_getattr': getattr}
+    exec(compile(source, '<to_dict>', 'exec'), namespace)
+    return namespace['to_dict']
@@ -159,7 +159,8 @@ class ObjectJSON(object):
                 return {
                     '_numpy': self.simplify(obj.shape),
                     '_dtype': str(obj.dtype),
-                    '_data': base64.b64encode(obj.copy(order='C'))
+                    # only copies if the array isn't C-contiguous already
+                    '_data': base64.b64encode(np.ascontiguousarray(obj))
                 }
             elif hasattr(obj, 'to_dict'):
                 # the object knows how to dismantle itself into a json string
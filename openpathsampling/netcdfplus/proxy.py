@@ -6,7 +6,6 @@ import functools
 import weakref
 
 from .base import StorableObject
-from six import exec_
 
 
 # =============================================================================
@@ -39,11 +38,21 @@ class LoaderProxy(object):
 
     @property
     def __subject__(self):
-        if self._subject is not None:
-            obj = self._subject()
+        return self._loaded_subject()
+
+    def _loaded_subject(self):
+        # the hot methods below call this directly to skip the property; it
+        # only reloads if the object is gone. The weakref is deliberate: a
+        # proxy must not keep its object alive (the store's caches decide
+        # that)
+        subject = self._subject
+        if subject is not None:
+            obj = subject()
             if obj is not None:
                 return obj
+        return self._reload_()
 
+    def _reload_(self):
         ref = self._load_()
 
         if ref is None:
@@ -64,13 +73,16 @@ class LoaderProxy(object):
         if self is other:
             return True
 
-        if hasattr(other, '__uuid__'):
-            return self.__uuid__ == other.__uuid__
+        # one attribute lookup; another proxy has __uuid__ in its slots, so
+        # comparing two proxies never loads either of them
+        other_uuid = getattr(other, '__uuid__', None)
+        if other_uuid is not None:
+            return self.__uuid__ == other_uuid
 
         return NotImplemented
 
     def __getitem__(self, item):
-        return self.__subject__[item]
+        return self._loaded_subject()[item]
 
     def __ne__(self, other):
         return not self == other
@@ -79,14 +91,14 @@ class LoaderProxy(object):
         return self.__uuid__ & 1152921504606846975
 
     def __len__(self):
-        return len(self.__subject__)
+        return len(self._loaded_subject())
 
     @property
     def __class__(self):
         return self._store.content_class
 
     def __getattr__(self, item):
-        return getattr(self.__subject__, item)
+        return getattr(self._loaded_subject(), item)
 
     def _load_(self):
         """
@@ -114,7 +126,9 @@ class DelayedLoader(object):
     def __get__(self, instance, owner):
         if instance is not None:
             obj = instance._lazy[self]
-            if hasattr(obj, '_idx'):
+            # type() sees through the __class__ property of a proxy; unlike
+            # hasattr, this never loads the object just to test for it
+            if type(obj) is LoaderProxy:
                 return obj.__subject__
             else:
                 return obj
@@ -167,14 +181,7 @@ def lazy_loading_attributes(*attributes):
 
         _super_init = cls.__init__
 
-        code = 'def _init(self, %s):'
-
-        source_code = '\n'.join(code)
-        cc = compile(source_code, '<string>', 'exec')
-        #exec cc in locals()
-        exec_(cc, locals())
-
-        @functools.wraps(cls.__init__)
+        @functools.wraps(_super_init)
         def _init(self, *args, **kwargs):
             self._lazy = {}
             _super_init(self, *args, **kwargs)
@@ -5,7 +5,60 @@ import math
 from .lookup_function import LookupFunction, VoxelLookupFunction
 import collections
 import warnings
-from functools import reduce
+
+
+def _bin_index_batch(data, left_bin_edges, bin_widths):
+    """Integer bin indices for each row of an (N, D) array of data.
+
+    Parameters
+    ----------
+    data : np.array
+        input data, shape (N, D)
+    left_bin_edges : np.array
+        lesser side of the bin (for each direction), shape (D,)
+    bin_widths : np.array
+        bin (voxel) size, shape (D,)
+
+    Returns
+    -------
+    np.array :
+        C-contiguous int64 array of shape (N, D) with the bin for each row
+    """
+    bins = np.floor((data - left_bin_edges) / bin_widths)
+    return np.ascontiguousarray(bins, dtype=np.int64)
+
+
+def _pack_bins(bins):
+    """Pack each row of an (N, D) array of bin indices into one int64.
+
+    Parameters
+    ----------
+    bins : np.array
+        integer bin indices, shape (N, D), with N > 0
+
+    Returns
+    -------
+    packed : np.array or None
+        int64 array of shape (N,) with a unique scalar key for each
+        distinct row; None if the occupied range of bins is too large to
+        be packed into an int64
+    offset : np.array
+        minimum bin in each direction (needed to unpack)
+    shape : tuple of int
+        number of bins spanned in each direction (needed to unpack)
+    """
+    offset = bins.min(axis=0)
+    shape = tuple(int(s) for s in bins.max(axis=0) - offset + 1)
+    if np.prod(shape, dtype=np.float64) > np.iinfo(np.int64).max:
+        return None, offset, shape
+    packed = np.ravel_multi_index(tuple((bins - offset).T), shape)
+    return packed, offset, shape
+
+
+def _unpack_bins(packed, offset, shape):
+    """Inverse of :func:`._pack_bins`; returns an (N, D) int64 array"""
+    unpacked = np.column_stack(np.unravel_index(packed, shape))
+    return unpacked.astype(np.int64) + offset
 
 
 class SparseHistogram(object):
@@ -25,9 +78,27 @@ class SparseHistogram(object):
             self.left_bin_edges = None
         else:
             self.left_bin_edges = np.array(left_bin_edges)
+        self._set_bin_geometry()
         self.count = 0
         self.name = None
         self._histogram = None
+        self._cache = {}
+
+    def _set_bin_geometry(self):
+        """Store derived bin quantities; call whenever the bins change"""
+        # bins can be unknown until data is given (see Histogram)
+        if self.bin_widths.dtype == object or self.left_bin_edges is None:
+            self._voxel_volume = None
+            self._left_edges_f64 = None
+            self._widths_f64 = None
+        else:
+            self._voxel_volume = float(np.prod(self.bin_widths))
+            # contiguous float64 so batch binning needs no conversion
+            self._left_edges_f64 = np.ascontiguousarray(
+                self.left_bin_edges, dtype=np.float64
+            )
+            self._widths_f64 = np.ascontiguousarray(self.bin_widths,
+                                                    dtype=np.float64)
 
     def empty_copy(self):
         """Returns a new histogram with the same bin shape, but empty"""
@@ -51,26 +122,64 @@ class SparseHistogram(object):
         if data is None and self._histogram is None:
             raise RuntimeError("histogram() called without data!")
         elif data is not None:
-            self._histogram = collections.Counter({})
+            self._histogram = collections.defaultdict(float)
+            self._histogram_changed()
             return self.add_data_to_histogram(data, weights)
         else:
-            return self._histogram.copy()
+            return collections.Counter(self._histogram)
 
     @staticmethod
     def sum_histograms(hists):
         # (w, r) = (hists[0].bin_width, hists[0].bin_range)
         # newhist = Histogram(bin_width=w, bin_range=r)
         newhist = hists[0].empty_copy()
-        newhist._histogram = collections.Counter({})
+        newhist._histogram = collections.defaultdict(float)
 
         for hist in hists:
             if not newhist.compare_parameters(hist):
                 raise RuntimeError
             newhist.count += hist.count
-            newhist._histogram += hist._histogram
+            for (k, v) in hist._histogram.items():
+                newhist._histogram[k] += v
 
+        newhist._histogram_changed()
         return newhist
 
+    def _histogram_changed(self):
+        """Discard values cached from the contents of the histogram.
+
+        Must be called whenever the internal histogram is modified.
+        """
+        self._cache = {}
+
+    def _int_bins(self):
+        """Occupied bins as an (N, D) int64 array, in key order"""
+        int_bins = self._cache.get('int_bins')
+        if int_bins is None:
+            n_dims = len(self.bin_widths)
+            int_bins = np.fromiter(
+                (b for key in self._histogram for b in key),
+                dtype=np.int64,
+                count=len(self._histogram) * n_dims
+            ).reshape(-1, n_dims)
+            self._cache['int_bins'] = int_bins
+        return int_bins
+
+    def _bin_bounds(self):
+        """Minimum and maximum occupied bin along each axis.
+
+        Returns
+        -------
+        tuple of (np.array, np.array) :
+            the lowest and highest occupied bin in each direction
+        """
+        bounds = self._cache.get('bin_bounds')
+        if bounds is None:
+            int_bins = self._int_bins()
+            bounds = (int_bins.min(axis=0), int_bins.max(axis=0))
+            self._cache['bin_bounds'] = bounds
+        return bounds
+
     def map_to_float_bins(self, trajectory):
         return (np.asarray(trajectory) - self.left_bin_edges) / self.bin_widths
 
@@ -85,11 +194,33 @@ class SparseHistogram(object):
         -------
         tuple:
             the bin that the data represents
+
+        See also
+        --------
+        map_to_bins_batch : same mapping for many datapoints at once
         """
         # Reshape data to prevent accidental wrong output
         data = np.asarray(data).reshape(self.left_bin_edges.shape)
         return tuple(np.floor((data - self.left_bin_edges) / self.bin_widths))
 
+    def map_to_bins_batch(self, data):
+        """Map many datapoints (e.g., a whole trajectory) to their bins.
+
+        Parameters
+        ----------
+        data : list of list or np.array
+            input data; one row per datapoint
+
+        Returns
+        -------
+        np.array :
+            int64 array of shape (n_datapoints, n_dimensions), where each
+            row is the bin for that datapoint (as in :meth:`.map_to_bins`)
+        """
+        n_dims = len(self._left_edges_f64)
+        data = np.asarray(data, dtype=np.float64).reshape(-1, n_dims)
+        return _bin_index_batch(data, self._left_edges_f64, self._widths_f64)
+
     def add_data_to_histogram(self, data, weights=None):
         """Adds data to the internal histogram counter.
 
@@ -108,16 +239,74 @@ class SparseHistogram(object):
         """
         if self._histogram is None:
             return self.histogram(data, weights)
+
+        # assign every datapoint to its bin in one pass, then reduce the
+        # weights within each occupied bin
+        bins = self.map_to_bins_batch(data)
         if weights is None:
-            weights = [1.0]*len(data)
+            weights_arr = np.ones(len(bins))
+        else:
+            weights_arr = np.asarray(weights, dtype=np.float64)
+
+        if len(bins) > 0:
+            occupied, counts = self._bin_counts(bins, weights_arr)
+            bounds = self._cache.get('bin_bounds')
+            keep = np.ones(len(counts), dtype=bool)
+            for (i, (k, v)) in enumerate(zip(map(tuple, occupied.tolist()),
+                                             counts.tolist())):
+                total = self._histogram.get(k, 0.0) + v
+                if total > 0:
+                    self._histogram[k] = total
+                else:
+                    # like Counter addition, bins with no positive weight
+                    # are dropped
+                    self._histogram.pop(k, None)
+                    keep[i] = False
+                    bounds = None
+            occupied = occupied[keep]
+            self._histogram_changed()
+            if bounds is not None and len(occupied) > 0:
+                # update incrementally instead of rescanning all keys
+                self._cache['bin_bounds'] = (
+                    np.minimum(bounds[0], occupied.min(axis=0)),
+                    np.maximum(bounds[1], occupied.max(axis=0))
+                )
+
+        self.count += len(bins) if weights is None else weights_arr.sum()
+        return collections.Counter(self._histogram)
+
+    def _bin_counts(self, bins, weights):
+        """Total weight in each occupied bin.
 
-        part_hist = sum((collections.Counter({self.map_to_bins(d): w})
-                         for (d, w) in zip(data, weights)),
-                        collections.Counter({}))
+        Parameters
+        ----------
+        bins : np.array
+            integer bin for each datapoint, shape (N, D), with N > 0
+        weights : np.array
+            weight for each datapoint, shape (N,)
 
-        self._histogram += part_hist
-        self.count += len(data) if weights is None else sum(weights)
-        return self._histogram.copy()
+        Returns
+        -------
+        occupied : np.array
+            the distinct bins with positive total weight, shape (M, D)
+        counts : np.array
+            total weight in each of those bins, shape (M,)
+        """
+        packed, offset, shape = _pack_bins(bins)
+        if packed is not None:
+            keys, inverse = np.unique(packed, return_inverse=True)
+            occupied = _unpack_bins(keys, offset, shape)
+        else:
+            # too spread out to pack: use the raw bytes of each row as a
+            # single fixed-width key instead
+            n_dim = bins.shape[1]
+            bins = np.ascontiguousarray(bins, dtype=np.int64)
+            rows = bins.view(np.dtype((np.void, 8 * n_dim))).ravel()
+            keys, inverse = np.unique(rows, return_inverse=True)
+            occupied = keys.view(np.int64).reshape(-1, n_dim)
+        counts = np.bincount(inverse.ravel(), weights=weights)
+        nonempty = counts > 0
+        return occupied[nonempty], counts[nonempty]
 
     @staticmethod
     def _left_edge_to_bin_edge_type(left_bins, widths, bin_edge_type):
@@ -147,15 +336,23 @@ class SparseHistogram(object):
         np.array :
             The values of the bin edges
         """
-        int_bins = np.array(self._histogram.keys())
-        left_bins = int_bins * self.bin_widths + self.left_bin_edges
-        return self._left_edge_to_bin_edge_type(left_bins, self.bin_widths,
-                                                bin_edge_type)
+        xvals = self._cache.get(('xvals', bin_edge_type))
+        if xvals is None:
+            left_bins = self._int_bins() * self.bin_widths
+            left_bins += self.left_bin_edges
+            xvals = self._left_edge_to_bin_edge_type(left_bins,
+                                                     self.bin_widths,
+                                                     bin_edge_type)
+            if xvals is not None:
+                xvals.flags.writeable = False
+                self._cache[('xvals', bin_edge_type)] = xvals
+        # callers may modify the result; keep the cached array intact
+        return xvals.copy() if xvals is not None else None
 
     def __call__(self, bin_edge_type="m"):
         return VoxelLookupFunction(left_bin_edges=self.left_bin_edges,
                                    bin_widths=self.bin_widths,
-                                   counter=self._histogram)
+                                   counter=dict(self._histogram))
 
     def normalized(self, raw_probability=False, bin_edge="m"):
         """
@@ -175,11 +372,12 @@ class SparseHistogram(object):
         :class:`.VoxelLookupFunction`
             callable version of the normalized histogram
         """
-        voxel_vol = reduce(lambda x, y: x.__mul__(y), self.bin_widths)
-        scale = voxel_vol if not raw_probability else 1.0
+        scale = self._voxel_volume if not raw_probability else 1.0
         norm = 1.0 / (self.count * scale)
-        counter = collections.Counter({k: self._histogram[k] * norm
-                                       for k in self._histogram.keys()})
+        vals = np.fromiter(self._histogram.values(), dtype=np.float64,
+                           count=len(self._histogram))
+        vals *= norm
+        counter = dict(zip(self._histogram.keys(), vals.tolist()))
         return VoxelLookupFunction(left_bin_edges=self.left_bin_edges,
                                    bin_widths=self.bin_widths,
                                    counter=counter)
@@ -206,9 +404,9 @@ class SparseHistogram(object):
         if self.left_bin_edges is None or other.left_bin_edges is None:
             # this is to avoid a numpy warning on the next
             return self.left_bin_edges is other.left_bin_edges
-        if self.left_bin_edges != other.left_bin_edges:
+        if not np.array_equal(self.left_bin_edges, other.left_bin_edges):
             return False
-        if self.bin_widths != other.bin_widths:
+        if not np.array_equal(self.bin_widths, other.bin_widths):
             return False
         return True
 
@@ -287,29 +485,63 @@ class Histogram(SparseHistogram):
             self.bin_width = (max_val-min_val)/self.bins
             self.left_bin_edges = np.array((min_val,))
             self.bin_widths = np.array((self.bin_width,))
+            self._set_bin_geometry()
         return super(Histogram, self).histogram(data, weights)
 
+    def _bin_counts(self, bins, weights):
+        # uniform 1D bins: the bin number is already an offset into a dense
+        # array, so a single bincount does the reduction
+        idx = bins[:, 0]
+        offset = idx.min()
+        n_span = idx.max() - offset + 1
+        if n_span > 2 * (len(idx) + self.n_bins):
+            # outliers would make the dense array mostly empty
+            return super(Histogram, self)._bin_counts(bins, weights)
+        counts = np.bincount(idx - offset, weights=weights)
+        occupied = np.flatnonzero(counts > 0)
+        return (occupied + offset).reshape(-1, 1), counts[occupied]
+
     def xvals(self, bin_edge_type="l"):
-        int_bins = np.array(list(self._histogram.keys()))[:, 0]
-        # always include left_edge_bin as 0 point; always include 0 and
-        # greater bin values (but allow negative)
-        min_bin = min(min(int_bins), 0)
-        n_bins = max(int_bins) - min_bin + 1
-        width = self.bin_widths[0]
-        left_bins = (self.left_bin_edges[0] + np.arange(n_bins) * width)
-        return self._left_edge_to_bin_edge_type(left_bins, width,
-                                                bin_edge_type)
+        xvals = self._cache.get(('xvals', bin_edge_type))
+        if xvals is None:
+            (min_bins, max_bins) = self._bin_bounds()
+            # always include left_edge_bin as 0 point; always include 0 and
+            # greater bin values (but allow negative)
+            min_bin = min(min_bins[0], 0)
+            n_bins = max_bins[0] - min_bin + 1
+            width = self.bin_widths[0]
+            left_bins = (self.left_bin_edges[0] + np.arange(n_bins) * width)
+            xvals = self._left_edge_to_bin_edge_type(left_bins, width,
+                                                     bin_edge_type)
+            if xvals is not None:
+                xvals.flags.writeable = False
+                self._cache[('xvals', bin_edge_type)] = xvals
+        # callers may modify the result; keep the cached array intact
+        return xvals.copy() if xvals is not None else None
+
+    def _dense_counts(self):
+        """Counts for every bin, in the same order as :meth:`.xvals`"""
+        counts = self._cache.get('dense_counts')
+        if counts is None:
+            if self._histogram is None:
+                raise RuntimeError("histogram() called without data!")
+            n_keys = len(self._histogram)
+            int_bins = np.fromiter((k[0] for k in self._histogram),
+                                   dtype=np.int64, count=n_keys)
+            values = np.fromiter(self._histogram.values(),
+                                 dtype=np.float64, count=n_keys)
+            # same range as xvals: includes bin 0 and all occupied bins
+            min_bin = min(int_bins.min(), 0)
+            counts = np.zeros(int_bins.max() - min_bin + 1)
+            counts[int_bins - min_bin] = values
+            counts.flags.writeable = False
+            self._cache['dense_counts'] = counts
+        return counts
 
     def __call__(self, bin_edge="m"):
         """Return copy of histogram if it has already been built"""
         vals = self.xvals(bin_edge)
-        hist = self.histogram()
-        bins = sorted(hist.keys())
-        min_bin = min(bins[0][0], 0)
-        max_bin = bins[-1][0]
-        bin_range = range(int(min_bin), int(max_bin)+1)
-        hist_list = [hist[(b,)] for b in bin_range]
-        return LookupFunction(vals, hist_list)
+        return LookupFunction(vals, self._dense_counts())
 
     def compare_parameters(self, other):
         """Return true if `other` has the same bin parameters as `self`.
@@ -330,19 +562,23 @@ class Histogram(SparseHistogram):
 
     def _normalization(self):
         """Return normalization constant (integral over this histogram)."""
-        hist = self('l')
-        bin_edges = self.xvals('l')
-        dx = [bin_edges[i+1] - bin_edges[i] for i in range(len(bin_edges)-1)]
-        dx += [dx[-1]]  # assume the "forever" bin is same as last limited
-        norm = np.dot(hist.values(), dx)
+        # cached with the xvals; the plotting/analysis paths call this
+        # repeatedly on an unchanged histogram
+        norm = self._cache.get('normalization')
+        if norm is None:
+            counts = self._dense_counts()
+            bin_edges = self.xvals('l')
+            dx = np.empty_like(bin_edges)
+            dx[:-1] = np.diff(bin_edges)
+            # assume the "forever" bin is same as last limited
+            dx[-1] = self.bin_widths[0]
+            norm = float(np.dot(counts, dx))
+            self._cache['normalization'] = norm
         return norm
 
-    # Yes, the following could be cached. No, I don't think it is worth it.
-    # Keep in mind that we need a separate cache for each one that we build,
-    # and that typically it will take almost no time to build one of these
-    # (runtime in linear in number of histogram bins). Adding caching
-    # complicates the code for no real benefit (you're more likely to suffer
-    # from L2 cache misses than to get a speedup).
+    # The results below are built from the cached xvals and normalization,
+    # but are not cached themselves: they are returned to the user, and
+    # building one is linear in the number of histogram bins.
 
     def normalized(self, raw_probability=False, bin_edge="m"):
         """Return normalized version of histogram.
@@ -353,26 +589,22 @@ class Histogram(SparseHistogram):
         histogram normalized by the sum of the bin counts, with no
         consideration of the bin widths.
         """
-        normed_hist = self()  # returns a copy
         nnorm = self._normalization() if not raw_probability else self.count
         norm = 1.0/nnorm
-        normed_hist_list = [normed_hist(k) * norm for k in normed_hist.keys()]
+        # same bin order as xvals; multiplying makes a new (writeable) array
+        normed_hist = self._dense_counts() * norm
         xvals = self.xvals(bin_edge)
-        return LookupFunction(xvals, normed_hist_list)
+        return LookupFunction(xvals, normed_hist)
 
     def cumulative(self, maximum=1.0, bin_edge="r"):
         """Cumulative from the left: number of values less than bin value.
 
         Use `maximum=None` to get the raw counts.
         """
-        cumul_hist = []
-        total = 0.0
         hist = self(bin_edge)
-        for k in sorted(hist.keys()):
-            total += hist(k)
-            cumul_hist.append(total)
-
-        cumul_hist = np.array(cumul_hist)
+        # LookupFunction values are ordered by increasing bin value
+        cumul_hist = np.cumsum(hist.values(), dtype=np.float64)
+        total = cumul_hist[-1]
         if total == 0:
             warnings.warn("No non-zero data in the histogram")
         elif maximum is not None:
@@ -386,14 +618,10 @@ class Histogram(SparseHistogram):
 
         Use `maximum=None` to get the raw counts.
         """
-        cumul_hist = []
-        total = 0.0
         hist = self(bin_edge)
-        for k in reversed(sorted(hist.keys())):
-            total += hist(k)
-            cumul_hist.insert(0, total)
-
-        cumul_hist = np.array(cumul_hist)
+        # LookupFunction values are ordered by increasing bin value
+        cumul_hist = np.cumsum(hist.values()[::-1], dtype=np.float64)[::-1]
+        total = cumul_hist[0]
         if total == 0:
             warnings.warn("No non-zero data in the histogram")
         elif maximum is not None:
@@ -421,16 +649,17 @@ class Histogram(SparseHistogram):
 def histograms_to_pandas_dataframe(hists, fcn="histogram", fcn_args={}):
     """Converts histograms in hists to a pandas data frame"""
     keys = None
-    frames = []
-    for hist in hists:
+    all_series = []
+    for (i, hist) in enumerate(hists):
         # check that the keys match
+        hist_keys = hist.xvals()
         if keys is None:
-            keys = hist.xvals()
-        for (t, b) in zip(keys, hist.xvals()):
-            if t != b:
-                raise Warning("Bins don't match up")
+            keys = hist_keys
+        n_shared = min(len(keys), len(hist_keys))
+        if not np.array_equal(keys[:n_shared], hist_keys[:n_shared]):
+            raise RuntimeError("Bins don't match up")
         if hist.name is None:
-            hist.name = int(hists.index(hist))
+            hist.name = i
 
         hist_data = {
             "histogram": hist,
@@ -447,8 +676,8 @@ def histograms_to_pandas_dataframe(hists, fcn="histogram", fcn_args={}):
             "cumulative": "r"
         }[fcn]
         xvals = hist.xvals(bin_edge)
-        frames.append(pd.DataFrame({hist.name: hist_data}, index=xvals))
-    all_frames = pd.concat(frames, axis=1)
+        all_series.append(pd.Series(hist_data, index=xvals, name=hist.name))
+    all_frames = pd.concat(all_series, axis=1)
     return all_frames.fillna(0.0)
 
 
@@ -584,8 +813,8 @@ class HistogramPlotter2D(object):
         lims_ = self.to_bins(lims, dof)
         ticks = [] if ticks_ is None else list(ticks_)
         lims = [] if lims_ is None else list(lims_)
-        range_ = (int(min(list(hist) + ticks + lims)),
-                  int(max(list(hist) + ticks + lims)))
+        bounds = [np.min(hist), np.max(hist)] + ticks + lims
+        range_ = (int(min(bounds)), int(max(bounds)))
         if lims_ is None:
             lims_ = (0, range_[1] - range_[0])
         else:
@@ -630,7 +859,9 @@ class HistogramPlotter2D(object):
             xlim = self.xlim
         if ylim is None:
             ylim = self.ylim
-        x, y = list(zip(*self.histogram._histogram.keys()))
+        # only the extremes matter; avoid unpacking every key
+        mins, maxs = self.histogram._bin_bounds()
+        x, y = zip(mins, maxs)
         xticks_, xrange_, xlim_ = self.axis_input(x, xticklabels, xlim, dof=0)
         yticks_, yrange_, ylim_ = self.axis_input(y, yticklabels, ylim, dof=1)
         self.xrange_ = xrange_
@@ -256,19 +256,27 @@ class VoxelLookupFunction(object):
         if len(self.left_bin_edges) != 2:
             raise RuntimeError("Can't make 2D dataframe from non-2D data!")
         counter = self.counter
-        index = None
-        columns = None
+        bins = np.fromiter((b for k in counter.keys() for b in k),
+                           dtype=np.int64,
+                           count=2*len(counter)).reshape(-1, 2)
+        vals = np.fromiter(counter.values(), dtype=np.float64,
+                           count=len(counter))
+        index = np.unique(bins[:, 0])
+        columns = np.unique(bins[:, 1])
         if x_range is not None:
-            index = range(x_range[0], x_range[1]+1)
+            index = np.union1d(np.arange(x_range[0], x_range[1]+1), index)
         if y_range is not None:
-            columns = range(y_range[0], y_range[1]+1)
-        df = pd.DataFrame(index=index, columns=columns)
-        for (k,v) in counter.items():
-            df.at[k[0], k[1]] = v
-        df = df.sort_index(0).sort_index(1)
+            columns = np.union1d(np.arange(y_range[0], y_range[1]+1),
+                                 columns)
+        # scatter all values at once; empty bins are NaN
+        values = np.full((len(index), len(columns)), np.nan)
+        rows = np.searchsorted(index, bins[:, 0])
+        cols = np.searchsorted(columns, bins[:, 1])
+        values[rows, cols] = vals
+        df = pd.DataFrame(values, index=index, columns=columns)
         return df
 
     def __call__(self, value):
         val_bin = tuple(np.floor(self.val_to_bin(value)))
-        return self.counter[val_bin]
+        return self.counter.get(val_bin, 0.0)
 
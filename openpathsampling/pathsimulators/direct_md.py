@@ -82,6 +82,13 @@ class DirectSimulation(PathSimulator):
         first_interface_exit = {p: -1 for p in self.flux_pairs}
         last_state_visit = {s: -1 for s in self.states}
         was_in_interface = {p: None for p in self.flux_pairs}
+        # loop invariants: the flux pairs for each state, and each pair
+        # unpacked once rather than on every frame
+        state_flux_pairs = {s: [p for p in self.flux_pairs if p[0] == s]
+                            for s in self.states}
+        flux_pairs = [(p, p[0], p[1]) for p in self.flux_pairs]
+        states = self.states
+        save_traj = self.storage is not None
         local_traj = paths.Trajectory([self.initial_snapshot])
         self.engine.current_snapshot = self.initial_snapshot
         self.engine.start()
@@ -90,7 +97,7 @@ class DirectSimulation(PathSimulator):
 
             # update the most recent state if we're in a state
             state = None  # no state at all
-            for s in self.states:
+            for s in states:
                 if s(frame):
                     state = s
             if state:
@@ -98,9 +105,7 @@ class DirectSimulation(PathSimulator):
                 if state is not most_recent_state:
                     # we've made a transition: on the first entrance into
                     # this state, we reset the last_interface_exit
-                    state_flux_pairs = [p for p in self.flux_pairs
-                                        if p[0] == state]
-                    for p in state_flux_pairs:
+                    for p in state_flux_pairs.get(state, []):
                         first_interface_exit[p] = -1
                     # if this isn't the first change of state, we add the
                     # transition
@@ -109,9 +114,7 @@ class DirectSimulation(PathSimulator):
                     most_recent_state = state
 
             # update whether we've left any interface
-            for p in self.flux_pairs:
-                state = p[0]
-                interface = p[1]
+            for (p, state, interface) in flux_pairs:
                 is_in_interface = interface(frame)
                 # by line: (1) this is a crossing; (2) the most recent state
                 # is correct; (3) this is the FIRST crossing
@@ -129,8 +132,8 @@ class DirectSimulation(PathSimulator):
                     first_interface_exit[p] = step
                 was_in_interface[p] = is_in_interface
 
-            if self.storage is not None:
-                local_traj += [frame]
+            if save_traj:
+                local_traj.append(frame)
 
         self.engine.stop(local_traj)
 
@@ -139,18 +142,17 @@ class DirectSimulation(PathSimulator):
 
     @property
     def transitions(self):
-        prev_state = None
-        prev_time = None
         results = {}
-        for (new_state, time) in self.transition_count:
+        # pair each transition with the one before it
+        for ((prev_state, prev_time), (new_state, time)) in zip(
+            self.transition_count, self.transition_count[1:]
+        ):
             if prev_state is not None and prev_time is not None:
                 lag = time - prev_time
                 try:
-                    results[(prev_state, new_state)] += [lag]
+                    results[(prev_state, new_state)].append(lag)
                 except KeyError:
                     results[(prev_state, new_state)] = [lag]
-            prev_state = new_state
-            prev_time = time
         return results
 
     @property
@@ -160,9 +162,13 @@ class DirectSimulation(PathSimulator):
             time_per_step = self.engine.snapshot_timestep
         except AttributeError:
             time_per_step = 1.0
-        total_time = {s: sum(sum((transitions[t] for t in transitions
-                                  if t[0] == s), [])) * time_per_step
-                      for s in self.states}
+        # one pass over the transitions, instead of concatenating the lag
+        # lists of every transition out of each state
+        total_steps = {s: 0 for s in self.states}
+        for t in transitions:
+            total_steps[t[0]] += sum(transitions[t])
+        total_time = {s: total_steps[s] * time_per_step
+                      for s in total_steps}
 
         rates = {t : len(transitions[t]) / total_time[t[0]]
                  for t in transitions}
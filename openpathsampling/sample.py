@@ -1,3 +1,4 @@
+import bisect
 import random
 import logging
 
@@ -77,8 +78,13 @@ class SampleSet(StorableObject, Mapping):
         self._lazy = {}
 
         self.samples = []
+        # same contents as self.samples, for O(1) membership tests (samples
+        # hash and compare by UUID, so this matches `in self.samples`)
+        self._sample_set = set()
         self.ensemble_dict = {}
         self.replica_dict = {}
+        self._max_replica = None  # highest key of replica_dict
+        self._sorted_replicas = None  # sorted replica_dict keys, lazily
         self.extend(samples)
         self.movepath = movepath
 
@@ -94,20 +100,23 @@ class SampleSet(StorableObject, Mapping):
         return self.replica_dict.keys()
 
     def __getitem__(self, key):
-        if isinstance(key, paths.Ensemble):
-            return random.choice(self.ensemble_dict[key])
-        elif type(key) is int:
+        # replica lookup first: it is by far the most common
+        if type(key) is int:
             return random.choice(self.replica_dict[key])
+        elif isinstance(key, paths.Ensemble):
+            return random.choice(self.ensemble_dict[key])
         elif hasattr(key, '__iter__'):
             return (self[element] for element in key)
         elif type(key) is slice:
-            rep_idxs = filter(
-                lambda x:
-                    (key.start is None or x >= key.start) and
-                    (key.stop is None or x < key.stop),
-                sorted(self.replica_dict.keys())
-
-            )
+            replicas = self._sorted_replicas
+            if replicas is None:
+                replicas = sorted(self.replica_dict)
+                self._sorted_replicas = replicas
+            start = 0 if key.start is None \
+                    else bisect.bisect_left(replicas, key.start)
+            stop = len(replicas) if key.stop is None \
+                    else bisect.bisect_left(replicas, key.stop)
+            rep_idxs = replicas[start:stop]
 
             return (self[element] for element in rep_idxs)
 
@@ -120,7 +129,7 @@ class SampleSet(StorableObject, Mapping):
             if key != value.replica:
                 raise SampleKeyError(key, value, value.replica)
 
-        if value in self.samples:
+        if value in self._sample_set:
             # if value is already in this, we don't need to do anything
             return
         # Setting works by replacing one with the same key. We pick one with
@@ -136,7 +145,9 @@ class SampleSet(StorableObject, Mapping):
         self.append(value)
 
     def __eq__(self, other):
-        return Counter(self.samples) == Counter(other.samples)
+        # samples are unique within a SampleSet, so comparing the
+        # membership sets is the same as comparing sample counts
+        return self._sample_set == other._sample_set
 
     def __ne__(self, other):
         return not self == other
@@ -148,7 +159,12 @@ class SampleSet(StorableObject, Mapping):
             del self.ensemble_dict[sample.ensemble]
         if len(self.replica_dict[sample.replica]) == 0:
             del self.replica_dict[sample.replica]
+            self._sorted_replicas = None
+            if sample.replica == self._max_replica:
+                self._max_replica = max(self.replica_dict) \
+                        if self.replica_dict else None
         self.samples.remove(sample)
+        self._sample_set.discard(sample)
 
     # TODO: add support for remove and pop
 
@@ -161,7 +177,7 @@ class SampleSet(StorableObject, Mapping):
 
     def __contains__(self, item):
         # check for Sample, replica (int) and Ensemble, too
-        if item in self.samples:
+        if item in self._sample_set:
             return True
         elif item in self.ensemble_dict:
             return True
@@ -183,32 +199,63 @@ class SampleSet(StorableObject, Mapping):
             return []
 
     def append(self, sample):
-        if sample in self.samples:
+        if sample in self._sample_set:
             # question: would it make sense to raise an error here? can't
             # have more than one copy of the same sample, but should we
             # ignore it silently or complain?
             return
 
         self.samples.append(sample)
-        try:
-            self.ensemble_dict[sample.ensemble].append(sample)
-        except KeyError:
+        self._sample_set.add(sample)
+        # get() instead of catching KeyError: new ensembles/replicas are
+        # common when building a set, and raising is slow
+        ensemble_samples = self.ensemble_dict.get(sample.ensemble)
+        if ensemble_samples is None:
             self.ensemble_dict[sample.ensemble] = [sample]
-        try:
-            self.replica_dict[sample.replica].append(sample)
-        except KeyError:
-            self.replica_dict[sample.replica] = [sample]
+        else:
+            ensemble_samples.append(sample)
+
+        replica = sample.replica
+        replica_samples = self.replica_dict.get(replica)
+        if replica_samples is None:
+            self.replica_dict[replica] = [sample]
+            self._sorted_replicas = None
+            if self._max_replica is None or replica > self._max_replica:
+                self._max_replica = replica
+        else:
+            replica_samples.append(sample)
 
     def extend(self, samples):
         # note that this works whether the parameter samples is a list of
         # samples or a SampleSet!
         if type(samples) is not paths.Sample and hasattr(samples, '__iter__'):
+            # every sample goes through append, which keeps the buckets,
+            # membership set and replica bookkeeping in one place
+            append = self.append
             for sample in samples:
-                self.append(sample)
+                append(sample)
         else:
             # also acts as .append() if given a single sample
             self.append(samples)
 
+    def _copy(self):
+        """New SampleSet with the same samples (like ``SampleSet(self)``).
+
+        Copies the containers directly instead of appending (and
+        re-bucketing) each sample.
+        """
+        newset = SampleSet([])
+        newset.samples = list(self.samples)
+        newset._sample_set = set(self._sample_set)
+        newset.ensemble_dict = {ens: list(samps)
+                                for (ens, samps) in self.ensemble_dict.items()}
+        newset.replica_dict = {rep: list(samps)
+                               for (rep, samps) in self.replica_dict.items()}
+        newset._max_replica = self._max_replica
+        # never modified in place, only replaced, so it can be shared
+        newset._sorted_replicas = self._sorted_replicas
+        return newset
+
     def apply_samples(self, samples, copy=True):
         """Update by setting samples by replica in the order given
 
@@ -218,7 +265,7 @@ class SampleSet(StorableObject, Mapping):
         elif isinstance(samples, paths.MoveChange):
             samples = samples.results
         if copy:
-            newset = SampleSet(self)
+            newset = self._copy()
         else:
             newset = self
         for sample in samples:
@@ -247,10 +294,13 @@ class SampleSet(StorableObject, Mapping):
         """
         logger.info("Starting sanity check")
         for sample in self:
-            logger.info("Checking sanity of " + repr(sample.ensemble) +
-                        " with " + str(sample.trajectory))
+            # lazy formatting: the ensemble repr can be expensive, and this
+            # runs for every shot in a shooting simulation
+            logger.info("Checking sanity of %r with %s", sample.ensemble,
+                        sample.trajectory)
             try:
-                assert(sample.ensemble(sample.trajectory))
+                # Sample.valid caches the ensemble check on the sample
+                assert(sample.valid)
             except AssertionError as e:
                 failmsg = ("Trajectory does not match ensemble for replica "
                            + str(sample.replica))
@@ -270,12 +320,8 @@ class SampleSet(StorableObject, Mapping):
         """
 
         # check that we have the same number of samples in everything
-        nsamps_ens = 0
-        for ens in self.ensemble_dict.keys():
-            nsamps_ens += len(self.ensemble_dict[ens])
-        nsamps_rep = 0
-        for rep in self.replica_dict.keys():
-            nsamps_rep += len(self.replica_dict[rep])
+        nsamps_ens = sum(len(samps) for samps in self.ensemble_dict.values())
+        nsamps_rep = sum(len(samps) for samps in self.replica_dict.values())
         nsamps = len(self.samples)
         assert nsamps == nsamps_ens, \
             "nsamps != nsamps_ens : %d != %d" % (nsamps, nsamps_ens)
@@ -291,11 +337,16 @@ class SampleSet(StorableObject, Mapping):
             assert samp in self.replica_dict[samp.replica], \
                 "Sample not in replica_dict! %r %r" % (samp, self.replica_dict)
 
+        assert self._sample_set == set(self.samples), \
+            "Membership set does not match samples!"
+        expected_max = max(self.replica_dict) if self.replica_dict else None
+        assert self._max_replica == expected_max, \
+            "Max replica %r != %r" % (self._max_replica, expected_max)
+
         # finally, check to be sure that there are no duplicates in
         # self.samples; this completes the consistency check
-        for samp in self.samples:
-            assert self.samples.count(samp) == 1, \
-                    "More than one instance of %r!" % samp
+        for (samp, count) in Counter(self.samples).items():
+            assert count == 1, "More than one instance of %r!" % samp
 
     def append_as_new_replica(self, sample):
         """
@@ -304,10 +355,11 @@ class SampleSet(StorableObject, Mapping):
         The new replica ID is taken to be one greater than the highest
         previous replica ID.
         """
-        if len(self) == 0:
+        # tracked by append/__delitem__, so no scan over the samples
+        if self._max_replica is None:
             max_replica = -1
         else:
-            max_replica = max([s.replica for s in self.samples])
+            max_replica = self._max_replica
         self.append(Sample(
             replica=max_replica + 1,
             trajectory=sample.trajectory,
@@ -326,10 +378,17 @@ class SampleSet(StorableObject, Mapping):
         transition trajectory (which satisfies all ensembles) and use it as
         the starting point for all ensembles.
         """
+        # replica is the index of the first occurrence of each ensemble (as
+        # with ensembles.index), found in one pass instead of a scan each
+        replicas = {}
+        for (idx, ens) in enumerate(ensembles):
+            replicas.setdefault(ens, idx)
+        # Trajectory copies its input list, so the proxies can be shared
+        snapshots = trajectory.as_proxies()
         return SampleSet([
             Sample.initial_sample(
-                replica=ensembles.index(e),
-                trajectory=paths.Trajectory(trajectory.as_proxies()),  # copy
+                replica=replicas[e],
+                trajectory=paths.Trajectory(snapshots),  # copy
                 ensemble=e)
             for e in ensembles
         ])
@@ -349,11 +408,13 @@ class SampleSet(StorableObject, Mapping):
         The approach used here will return the SampleSet with the maximum
         number of ensembles that overlap between the two groups.
         """
+        # build each string description once, not once per pair
+        by_str = {str(ens2): ens2 for ens2 in new_ensembles}
         translation = {}
         for ens1 in sset.ensemble_list():
-            for ens2 in new_ensembles:
-                if ens1.__str__() == ens2.__str__():
-                    translation[ens1] = ens2
+            ens1_str = str(ens1)
+            if ens1_str in by_str:
+                translation[ens1] = by_str[ens1_str]
 
         new_samples = []
         for ens in translation:
@@ -43,6 +43,25 @@ class TestFunctions(object):
         for i, c in enumerate(df.columns):
             assert str(c) == str(i)
 
+    def test_histograms_to_pandas_dataframe_bad_bins(self):
+        hists = [Histogram(bin_width=0.5, bin_range=(1.0, 3.5)),
+                 Histogram(bin_width=0.5, bin_range=(1.2, 3.7))]
+        for hist in hists:
+            _ = hist.histogram([1.5, 2.5, 3.0])
+        with pytest.raises(RuntimeError, match="Bins don't match"):
+            histograms_to_pandas_dataframe(hists)
+
+    def test_histograms_to_pandas_dataframe_dict_values(self):
+        data = [1.0, 1.1, 1.2, 1.3, 2.0, 1.4, 2.3, 2.5, 3.1, 3.5]
+        hists = {'a': Histogram(bin_width=0.5, bin_range=(1.0, 3.5)),
+                 'b': Histogram(bin_width=0.5, bin_range=(1.0, 3.5))}
+        _ = hists['a'].histogram(data)
+        _ = hists['b'].histogram(data[:4])
+        df = histograms_to_pandas_dataframe(hists.values(),
+                                            fcn="reverse_cumulative")
+        assert list(df.columns) == [0, 1]
+        assert list(df[1]) == [1.0, 0.0, 0.0, 0.0, 0.0, 0.0]
+
 
 class TestHistogram(object):
     def setup(self):
@@ -97,6 +116,23 @@ class TestHistogram(object):
         assert hist2 == hist+hist
         assert histogram.count == 20
 
+    def test_add_data_to_histogram_outlier(self):
+        histogram = Histogram(bin_width=0.5, bin_range=(1.0, 3.5))
+        hist = histogram.add_data_to_histogram(self.data + [1.0e6])
+        expected = self.hist + collections.Counter({(1999998,): 1})
+        assert hist == expected
+        assert histogram.count == 11
+
+    def test_add_data_to_histogram_zero_weight(self):
+        # dense bincount path and sparse fallback drop the same bins
+        for outlier in [2.9, 1.0e4]:
+            histogram = Histogram(bin_width=0.5, bin_range=(0.0, 2.0))
+            hist = histogram.add_data_to_histogram([0.5, outlier],
+                                                   weights=[1.0, 0.0])
+            assert hist == collections.Counter({(1,): 1.0})
+            assert dict(histogram._histogram) == {(1,): 1.0}
+            assert len(histogram.xvals()) == 2
+
     def test_compare_parameters(self):
         assert self.hist_nbins.compare_parameters(None) is False
         assert (
@@ -131,11 +167,24 @@ class TestHistogram(object):
         assert all(histo.xvals("l") == [1.0, 1.5, 2.0, 2.5, 3.0, 3.5])
         assert all(histo.xvals("r") == [1.5, 2.0, 2.5, 3.0, 3.5, 4.0])
         assert all(histo.xvals("m") == [1.25, 1.75, 2.25, 2.75, 3.25, 3.75])
+        # modifying the returned array doesn't change the cached values
+        xvals = histo.xvals("l")
+        xvals[0] = 100.0
+        assert all(histo.xvals("l") == [1.0, 1.5, 2.0, 2.5, 3.0, 3.5])
+
+    def test_xvals_after_add_data(self):
+        histo = Histogram(bin_width=0.5, bin_range=(1.0, 3.5))
+        _ = histo.histogram(self.data)
+        assert all(histo.xvals("l") == [1.0, 1.5, 2.0, 2.5, 3.0, 3.5])
+        _ = histo.add_data_to_histogram([4.2])
+        assert all(histo.xvals("l") == [1.0, 1.5, 2.0, 2.5, 3.0, 3.5, 4.0])
 
     def test_normalization(self):
         histo = Histogram(n_bins=5)
         _ = histo.histogram(self.data)
         assert histo._normalization() == 5.0
+        _ = histo.add_data_to_histogram(self.data)
+        assert histo._normalization() == 10.0
 
     def test_normalized(self):
         histo = Histogram(n_bins=5)
@@ -203,6 +252,65 @@ class TestSparseHistogram(object):
         })
         assert self.histo._histogram == correct_results
 
+    def test_add_data_to_histogram_3d(self):
+        histo = SparseHistogram(bin_widths=(1.0, 1.0, 1.0),
+                                left_bin_edges=(0.0, 0.0, 0.0))
+        data = [(0.5, -1.5, 2.5), (-3.5, 0.5, 0.5), (0.1, -1.1, 2.9)]
+        histo.histogram(data, weights=[1.0, 2.0, 0.5])
+        counter = histo.add_data_to_histogram([(-3.2, 0.2, 0.2)])
+        assert counter == collections.Counter({(0, -2, 2): 1.5,
+                                               (-4, 0, 0): 3.0})
+        assert histo.count == 4.5
+
+    def test_add_data_to_histogram_spread_out(self):
+        # range of bins too large to pack into a single integer key
+        histo = SparseHistogram(bin_widths=(1.0, 1.0, 1.0),
+                                left_bin_edges=(0.0, 0.0, 0.0))
+        data = [(0.5, 0.5, 0.5), (1.0e8, -1.0e8, 1.0e8), (0.2, 0.7, 0.1)]
+        counter = histo.histogram(data)
+        assert counter == collections.Counter({
+            (0, 0, 0): 2,
+            (100000000, -100000000, 100000000): 1
+        })
+
+    def test_add_data_to_histogram_zero_weight(self):
+        # bins without positive weight are dropped, as with Counter
+        histo = SparseHistogram(bin_widths=(1.0,), left_bin_edges=(0.0,))
+        counter = histo.histogram([[0.5], [5.5]], weights=[1.0, 0.0])
+        assert counter == collections.Counter({(0,): 1.0})
+        assert dict(histo._histogram) == {(0,): 1.0}
+        _ = histo.xvals("l")  # fill the bin_bounds cache
+        histo.add_data_to_histogram([[7.5]], weights=[0.0])
+        assert len(histo.xvals("l")) == 1
+        assert histo.count == 1.0
+
+    def test_xvals(self):
+        xvals = self.histo.xvals("l")
+        for (val, truth) in zip(sorted(map(tuple, xvals)),
+                                [(0.0, -0.1), (0.0, 0.5), (0.5, 0.8)]):
+            assert_items_almost_equal(val, truth)
+        _ = self.histo.add_data_to_histogram([(1.1, -0.1)])
+        assert len(self.histo.xvals("l")) == 4
+
+    def test_compare_parameters(self):
+        assert self.histo.compare_parameters(None) is False
+        assert self.histo.compare_parameters(self.histo.empty_copy())
+        other_edges = SparseHistogram(bin_widths=(0.5, 0.3),
+                                      left_bin_edges=(0.0, 0.0))
+        assert self.histo.compare_parameters(other_edges) is False
+        other_widths = SparseHistogram(bin_widths=(0.5, 0.5),
+                                       left_bin_edges=(0.0, -0.1))
+        assert self.histo.compare_parameters(other_widths) is False
+
+    def test_sum_histograms(self):
+        summed = SparseHistogram.sum_histograms([self.histo, self.histo])
+        assert summed.count == 8
+        assert summed._histogram == collections.Counter({
+            (0, 0): 2,
+            (0, 2): 4,
+            (1, 3): 2
+        })
+
     def test_call(self):
         histo_fcn = self.histo()
         # voxels we have filled
@@ -222,6 +330,13 @@ class TestSparseHistogram(object):
         assert pytest.approx(normed_fcn((0.01, 0.09))) == old_div(0.25, 0.15)
         assert pytest.approx(normed_fcn((0.61, 0.89))) == old_div(0.25, 0.15)
 
+    def test_map_to_bins_batch(self):
+        data = [(0.0, 0.1), (0.2, 0.7), (-0.3, 0.6), (0.6, -0.9)]
+        bins = self.histo.map_to_bins_batch(data)
+        assert bins.shape == (4, 2)
+        for (row, pt) in zip(bins, data):
+            assert tuple(row) == self.histo.map_to_bins(pt)
+
     def test_mangled_input(self):
         # Sometimes singleton cvs are not unpacked properly
         data = ([0.0], [0.1])
@@ -0,0 +1,131 @@
+from __future__ import absolute_import
+from builtins import object
+import gc
+
+from nose.tools import assert_equal, assert_true
+
+import openpathsampling as paths
+from openpathsampling.netcdfplus import (StorableObject, StorableNamedObject,
+                                         create_to_dict)
+
+
+class TestStorableObject(object):
+    def teardown(self):
+        StorableObject.set_observer(False)
+
+    def test_observer(self):
+        assert_equal(StorableObject.count_weaks(), {})
+        StorableObject.set_observer(True)
+        volumes = [paths.FullVolume() for _ in range(3)]
+        cv = paths.FunctionCV("x", lambda snap: snap.xyz[0][0])
+        assert_equal(StorableObject.count_weaks(),
+                     {'Volume': 3, 'PseudoAttribute': 1})
+        del volumes
+        gc.collect()
+        assert_equal(StorableObject.count_weaks(), {'PseudoAttribute': 1})
+
+        StorableObject.set_observer(False)
+        assert_equal(StorableObject.count_weaks(), {})
+        volume = paths.FullVolume()
+        assert_true(volume.__uuid__ is not None)
+        assert_equal(StorableObject.count_weaks(), {})
+
+    def test_base(self):
+        assert_equal(paths.CVDefinedVolume.base(), paths.Volume)
+        assert_equal(paths.Volume.base(), paths.Volume)
+        assert_equal(StorableObject.base(), None)
+
+        class NewBase(paths.Volume, StorableObject):
+            pass
+
+        assert_equal(NewBase.base(), NewBase)
+        assert_equal(StorableNamedObject.base(), None)
+
+        class NewSubclass(NewBase):
+            pass
+
+        if hasattr(object, '__init_subclass__'):
+            # resolved when the class is created
+            assert_true(NewBase.__dict__['_base'] is NewBase)
+            assert_true(NewSubclass.__dict__['_base'] is NewBase)
+        assert_equal(NewSubclass.base(), NewBase)
+
+    def test_args(self):
+        args = paths.CVDefinedVolume.args()
+        assert_equal(args, ['self', 'collectivevariable', 'lambda_min',
+                            'lambda_max'])
+        assert_true(paths.CVDefinedVolume.args() is args)
+        assert_equal(paths.Volume.args(), ['self'])
+
+    def test_descendants(self):
+        descendants = paths.Volume.descendants()
+        assert_true(paths.CVDefinedVolume in descendants)
+
+        class NewVolume(paths.CVDefinedVolume):
+            pass
+
+        assert_true(NewVolume not in descendants)
+        assert_true(NewVolume in paths.Volume.descendants())
+        assert_true(NewVolume in StorableObject.descendants())
+
+    def test_to_dict(self):
+        class ToDictTest(StorableObject):
+            _excluded_attr = ['skipped']
+            _included_attr = ['_kept']
+
+            def __init__(self):
+                super(ToDictTest, self).__init__()
+                self.normal = 1
+                self.skipped = 2
+                self._kept = 3
+                self._private = 4
+                self.idx = 5
+
+        obj = ToDictTest()
+        assert_equal(obj.to_dict(), {'normal': 1, '_kept': 3})
+        ToDictTest._exclude_private_attr = False
+        assert_equal(obj.to_dict(), {'normal': 1, '_kept': 3,
+                                     '_private': 4, '__uuid__': obj.__uuid__})
+
+    def test_from_dict(self):
+        class FromDictTest(StorableObject):
+            def __init__(self, foo):
+                super(FromDictTest, self).__init__()
+                self.foo = foo
+
+        obj = FromDictTest.from_dict({'foo': 1, 'bar': 2})
+        assert_equal((obj.foo, obj.bar), (1, 2))
+        assert_equal(FromDictTest._arg_set(), frozenset(['self', 'foo']))
+        FromDictTest._restore_non_initial_attr = False
+        obj = FromDictTest.from_dict({'foo': 1, 'bar': 2})
+        assert_true(not hasattr(obj, 'bar'))
+
+    def test_idx(self):
+        class IndexStore(object):
+            def __init__(self, index):
+                self.index = index
+
+        class IdxStore(object):
+            def idx(self, obj):
+                return 7
+
+        obj = StorableObject()
+        assert_equal(obj.idx(IndexStore({obj: 3})), 3)
+        assert_equal(obj.idx(IndexStore({})), None)
+        assert_equal(obj.idx(IdxStore()), 7)
+
+
+def test_create_to_dict():
+    class Stored(object):
+        to_dict = create_to_dict(['name', 'value', 'not-an-identifier',
+                                  u'\u00e9t\u00e9'])
+
+    obj = Stored()
+    obj.name = 'foo'
+    obj.value = 3
+    setattr(obj, 'not-an-identifier', 4)
+    setattr(obj, u'\u00e9t\u00e9', 5)
+    assert_equal(obj.to_dict(), {'name': 'foo', 'value': 3,
+                                 'not-an-identifier': 4,
+                                 u'\u00e9t\u00e9': 5})
+    assert_equal(create_to_dict([])(obj), {})
@@ -0,0 +1,111 @@
+from __future__ import absolute_import
+from builtins import object
+import gc
+
+from nose.tools import assert_equal, assert_true
+
+from openpathsampling.netcdfplus.proxy import (LoaderProxy, DelayedLoader,
+                                               lazy_loading_attributes)
+
+
+class LoadedObject(object):
+    def __init__(self, value):
+        self.value = value
+
+
+class CountingStore(object):
+    content_class = LoadedObject
+
+    def __init__(self):
+        self.n_loads = 0
+        self.kept = {}
+
+    def load(self, uuid):
+        self.n_loads += 1
+        obj = LoadedObject(uuid)
+        self.kept[uuid] = obj
+        return obj
+
+
+class HasDelayed(object):
+    delayed = DelayedLoader()
+
+    def __init__(self, delayed):
+        self._lazy = {}
+        self.delayed = delayed
+
+
+class TestLoaderProxy(object):
+    def setup(self):
+        self.store = CountingStore()
+        self.proxy = LoaderProxy(self.store, 5)
+
+    def test_getattr_loads_once(self):
+        assert_equal(self.proxy.value, 5)
+        assert_equal(self.proxy.value, 5)
+        assert_equal(self.store.n_loads, 1)
+
+    def test_reload_after_release(self):
+        assert_equal(self.proxy.value, 5)
+        # the proxy only keeps a weak reference to its object
+        self.store.kept.clear()
+        gc.collect()
+        assert_true(self.proxy._subject() is None)
+        assert_equal(self.proxy.value, 5)
+        assert_equal(self.store.n_loads, 2)
+
+    def test_new_reuses_live_proxy(self):
+        proxy = LoaderProxy.new(self.store, 7)
+        assert_true(LoaderProxy.new(self.store, 7) is proxy)
+        assert_true(LoaderProxy.new(self.store, 8) is not proxy)
+        del proxy
+        gc.collect()
+        assert_true(7 not in LoaderProxy._stash)
+
+    def test_eq_does_not_load(self):
+        same = LoaderProxy(self.store, 5)
+        other = LoaderProxy(self.store, 6)
+        assert_true(self.proxy == same)
+        assert_true(self.proxy != other)
+        assert_equal(len({self.proxy, same, other}), 2)
+        assert_equal(self.store.n_loads, 0)
+
+    def test_eq_loaded_object(self):
+        obj = LoadedObject(5)
+        obj.__uuid__ = 5
+        assert_true(self.proxy == obj)
+        assert_true(self.proxy != LoadedObject(5))
+        assert_equal(self.store.n_loads, 0)
+
+
+class TestDelayedLoader(object):
+    def test_get_proxy(self):
+        store = CountingStore()
+        obj = HasDelayed(LoaderProxy(store, 5))
+        assert_equal(store.n_loads, 0)
+        loaded = obj.delayed
+        assert_true(type(loaded) is LoadedObject)
+        assert_equal(loaded.value, 5)
+        assert_true(obj.delayed is loaded)
+        assert_equal(store.n_loads, 1)
+
+    def test_get_object(self):
+        value = LoadedObject(3)
+        obj = HasDelayed(value)
+        assert_true(obj.delayed is value)
+        assert_true(HasDelayed.delayed is HasDelayed.__dict__['delayed'])
+
+    def test_lazy_loading_attributes(self):
+        @lazy_loading_attributes('delayed')
+        class Decorated(object):
+            def __init__(self, delayed, other=None):
+                self.delayed = delayed
+                self.other = other
+
+        store = CountingStore()
+        obj = Decorated(LoaderProxy(store, 5), other=2)
+        assert_true(isinstance(Decorated.delayed, DelayedLoader))
+        assert_equal(Decorated.__init__.__name__, '__init__')
+        assert_equal(obj.other, 2)
+        assert_equal(store.n_loads, 0)
+        assert_equal(obj.delayed.value, 5)
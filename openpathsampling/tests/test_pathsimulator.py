@@ -577,6 +577,32 @@ class TestDirectSimulation(object):
         assert_true(len(self.sim.transition_count) > 1)
         assert_true(len(self.sim.flux_events[self.flux_pairs[0]]) > 1)
 
+    def test_run_saves_trajectory(self):
+        class SavedList(list):
+            def save(self, obj):
+                self.append(obj)
+
+        storage = SavedList()
+        sim = DirectSimulation(storage=storage,
+                               engine=self.engine,
+                               states=[self.center, self.outside],
+                               initial_snapshot=self.snap0)
+        sim.run(20)
+        assert_equal(len(storage), 1)
+        traj = storage[0]
+        assert_true(isinstance(traj, paths.Trajectory))
+        assert_equal(len(traj), 21)
+        assert_true(traj[0] is self.snap0)
+
+    def test_run_transition_count_format(self):
+        # (state, step) tuples in step order; this is the `results` format
+        self.sim.run(200)
+        steps = [step for (_, step) in self.sim.transition_count]
+        assert_equal(steps, sorted(steps))
+        for (state, step) in self.sim.transition_count:
+            assert_true(state in self.sim.states)
+            assert_true(isinstance(step, int))
+
     def test_results(self):
         self.sim.run(200)
         results = self.sim.results
@@ -32,6 +32,13 @@ class TestSampleSet(object):
         testset2 = SampleSet([self.s0A, self.s1A, self.s2B])
         assert_true(self.testset == testset2)
         assert_false(self.testset != testset2)
+        # order doesn't matter; contents do
+        testset3 = SampleSet([self.s2B, self.s0A, self.s1A])
+        assert_true(self.testset == testset3)
+        testset4 = SampleSet([self.s0A, self.s1A, self.s2B_])
+        assert_false(self.testset == testset4)
+        assert_true(self.testset != testset4)
+        assert_false(self.testset == SampleSet([self.s0A, self.s1A]))
 
     def test_initialization(self):
         self.testset.consistency_check()
@@ -59,6 +66,25 @@ class TestSampleSet(object):
         assert_equal(self.testset[2], self.s2B)
         # TODO: add test that we pick at random
 
+    def test_getitem_iterable(self):
+        assert_equal(list(self.testset[[2, 0]]), [self.s2B, self.s0A])
+        assert_equal(list(self.testset[(r for r in [1])]), [self.s1A])
+        assert_equal(list(self.testset[[self.ensB]]), [self.s2B])
+
+    def test_getitem_slice(self):
+        assert_equal(list(self.testset[1:]), [self.s1A, self.s2B])
+        assert_equal(list(self.testset[:2]), [self.s0A, self.s1A])
+        assert_equal(list(self.testset[-5:10]),
+                     [self.s0A, self.s1A, self.s2B])
+        assert_equal(list(self.testset[3:]), [])
+        # sorted replicas are kept in sync with added/removed replicas
+        s5A = Sample(replica=5, trajectory=self.s0A.trajectory,
+                     ensemble=self.ensA)
+        self.testset.append(s5A)
+        assert_equal(list(self.testset[2:]), [self.s2B, s5A])
+        del self.testset[self.s2B]
+        assert_equal(list(self.testset[1:]), [self.s1A, s5A])
+
     def test_setitem_ensemble(self):
         ensC = LengthEnsemble(3)
         traj3C = Trajectory([-0.5, -0.25, 0.1])
@@ -140,6 +166,8 @@ class TestSampleSet(object):
         assert_equal(self.ensA in list(self.testset.ensemble_dict.keys()), True)
         assert_equal(2 in list(self.testset.replica_dict.keys()), False)
         assert_equal(0 in list(self.testset.replica_dict.keys()), True)
+        assert_false(self.s2B in self.testset)
+        self.testset.consistency_check()
 
     def test_del_ensemble(self):
         raise SkipTest
@@ -148,7 +176,17 @@ class TestSampleSet(object):
         raise SkipTest
 
     def test_apply_samples(self):
-        raise SkipTest
+        newset = self.testset.apply_samples([self.s2B_])
+        newset.consistency_check()
+        assert_items_equal(newset, [self.s0A, self.s1A, self.s2B_])
+        # the original is untouched
+        self.testset.consistency_check()
+        assert_items_equal(self.testset, [self.s0A, self.s1A, self.s2B])
+        assert_true(newset.__uuid__ != self.testset.__uuid__)
+
+        sameset = self.testset.apply_samples(self.s2B_, copy=False)
+        assert_true(sameset is self.testset)
+        assert_items_equal(self.testset, [self.s0A, self.s1A, self.s2B_])
 
     def test_extend(self):
         testset = SampleSet([self.s0A])
@@ -167,6 +205,51 @@ class TestSampleSet(object):
         assert_equal(self.s2B_ in testset, True)
         testset.consistency_check()
 
+        # duplicates, within the input or with existing samples, are skipped
+        testset.extend([self.s0A, self.s2B_, self.s0A])
+        assert_equal(len(testset), 4)
+        testset.consistency_check()
+
+    def test_append_as_new_replica(self):
+        self.testset.append_as_new_replica(self.s0A)
+        assert_items_equal(self.testset.replica_list(), [0, 1, 2, 3])
+        assert_equal(self.testset[3].trajectory, self.s0A.trajectory)
+        self.testset.consistency_check()
+        # removing the highest replica lowers the next new replica ID
+        del self.testset[self.testset[3]]
+        del self.testset[self.s2B]
+        self.testset.consistency_check()
+        self.testset.append_as_new_replica(self.s2B)
+        assert_items_equal(self.testset.replica_list(), [0, 1, 2])
+        self.testset.consistency_check()
+
+        empty = SampleSet([])
+        empty.append_as_new_replica(self.s1A)
+        assert_items_equal(empty.replica_list(), [0])
+
+    def test_map_trajectory_to_ensembles(self):
+        traj = Trajectory([0.5])
+        sset = SampleSet.map_trajectory_to_ensembles(traj, [self.ensA,
+                                                            self.ensB])
+        sset.consistency_check()
+        assert_items_equal(sset.replica_list(), [0, 1])
+        samples = list(sset)
+        # every sample is a new, separately storable object
+        assert_true(samples[0] is not samples[1])
+        assert_true(samples[0].__uuid__ != samples[1].__uuid__)
+        assert_true(samples[0].trajectory is not samples[1].trajectory)
+        assert_equal(list(samples[0].trajectory), list(traj))
+
+    def test_translate_ensembles(self):
+        newA = LengthEnsemble(1)
+        newC = LengthEnsemble(3)  # no match in the sample set
+        sset = SampleSet.translate_ensembles(self.testset, [newC, newA])
+        sset.consistency_check()
+        assert_equal(len(sset), 2)
+        assert_same_items(sset.ensemble_list(), [newA])
+        assert_items_equal([s.trajectory for s in sset],
+                           [self.s0A.trajectory, self.s1A.trajectory])
+
     def test_replica_list(self):
         assert_items_equal(self.testset.replica_list(), [0, 1, 2])
         self.testset.append(self.s2B_)
@@ -196,17 +279,47 @@ class TestSampleSet(object):
         del self.testset.replica_dict[0]
         self.testset.consistency_check()
 
+    @raises(AssertionError)
+    def test_consistency_fail_membership_set(self):
+        self.testset._sample_set.discard(self.s0A)
+        self.testset.consistency_check()
+
     def test_consistency_fail_sample_in_ensdict(self):
         raise SkipTest
 
     def test_consistency_fail_sample_in_repdict(self):
         raise SkipTest
 
+    @raises(AssertionError)
     def test_consistency_fail_duplicate_samples(self):
-        raise SkipTest
+        # duplicate everywhere, so only the duplicate check can fail
+        self.testset.samples.append(self.s0A)
+        self.testset.ensemble_dict[self.ensA].append(self.s0A)
+        self.testset.replica_dict[0].append(self.s0A)
+        self.testset.consistency_check()
 
     def test_sanity(self):
         self.testset.sanity_check()
+        # the result of the ensemble check is kept on each sample
+        for sample in self.testset:
+            assert_true(sample._valid)
+
+    def test_sanity_cached(self):
+        class CountingEnsemble(LengthEnsemble):
+            n_calls = 0
+
+            def __call__(self, trajectory, trusted=None, candidate=False):
+                CountingEnsemble.n_calls += 1
+                return super(CountingEnsemble, self).__call__(trajectory)
+
+        ens = CountingEnsemble(1)
+        sample = Sample(replica=0, trajectory=self.s0A.trajectory,
+                        ensemble=ens)
+        testset = SampleSet([sample])
+        testset.sanity_check()
+        testset.sanity_check()
+        assert_true(sample.valid)
+        assert_equal(CountingEnsemble.n_calls, 1)
 
     @raises(AssertionError)
     def test_sanity_insane(self):
@@ -14,6 +14,7 @@ import openpathsampling as paths
 import openpathsampling.engines as peng
 import numpy as np
 import os
+import hashlib
 
 from openpathsampling.analysis.shooting_point_analysis import *
 
@@ -73,14 +74,23 @@ class TestTransformedDict(object):
         assert_equal(rehashed.hash_representatives,
                      {1: (0, 1), 2: (1, 2), 3: (2, 3)})
 
+    def test_rehash_merge(self):
+        # new hash maps (0, 1) and (1, 2) together: keep the first
+        # representative, and the value of the last
+        rehashed = self.test_dict.rehash(lambda x: x[1] // 2)
+        assert_equal(rehashed.store, {0: "a", 1: "c"})
+        assert_equal(rehashed.hash_representatives, {0: (0, 1), 1: (1, 2)})
+
 
 class TestSnapshotByCoordinateDict(object):
     def setup(self):
         self.empty_dict = SnapshotByCoordinateDict()
         coords_A = np.array([[0.0, 0.0]])
         coords_B = np.array([[1.0, 1.0]])
-        self.key_A = coords_A.tobytes()
-        self.key_B = coords_B.tobytes()
+        self.key_A = hashlib.blake2b(coords_A.tobytes(),
+                                     digest_size=16).digest()
+        self.key_B = hashlib.blake2b(coords_B.tobytes(),
+                                     digest_size=16).digest()
         self.snapA1 = peng.toy.Snapshot(coordinates=coords_A,
                                         velocities=np.array([[0.0, 0.0]]))
         self.snapA2 = peng.toy.Snapshot(coordinates=coords_A,
@@ -163,6 +173,58 @@ class TestShootingPointAnalysis(object):
         assert_true(0 < self.analyzer[self.snap1][self.left] < 20)
         assert_true(0 < self.analyzer[self.snap1][self.right] < 20)
 
+    def test_analyze_in_batches(self):
+        analyzer = ShootingPointAnalysis(None, [self.left, self.right])
+        # batch size is not a divisor of the number of steps
+        analyzer.analyze(self.storage.steps, batch_size=3)
+        assert_equal(len(analyzer), 2)
+        for snap in [self.snap0, self.snap1]:
+            for state in [self.left, self.right]:
+                assert_equal(analyzer[snap][state],
+                             self.analyzer[snap][state])
+
+    def test_analyze_extracts_points_once(self):
+        class CountingAnalysis(ShootingPointAnalysis):
+            n_calls = 0
+
+            def _key_and_test_points(self, step):
+                CountingAnalysis.n_calls += 1
+                return super(CountingAnalysis,
+                             self)._key_and_test_points(step)
+
+        steps = list(self.storage.steps)
+        CountingAnalysis(steps, [self.left, self.right])
+        assert_equal(CountingAnalysis.n_calls, len(steps))
+
+    def test_state_membership_by_topology(self):
+        class TopologySnapshot(object):
+            def __init__(self, topology, x):
+                self.topology = topology
+                self.x = x
+
+        class RecordingVolume(paths.Volume):
+            def __init__(self):
+                super(RecordingVolume, self).__init__()
+                self.calls = []
+
+            def __call__(self, snapshot):
+                return snapshot.x > 0
+
+            def contains_all(self, snapshots):
+                self.calls.append([s.topology for s in snapshots])
+                return super(RecordingVolume, self).contains_all(snapshots)
+
+        state = RecordingVolume()
+        points = [TopologySnapshot('A', 1.0), TopologySnapshot('B', -1.0),
+                  TopologySnapshot('A', -1.0)]
+        analyzer = ShootingPointAnalysis(None, [state, ~state])
+        membership = analyzer._state_membership(points)
+        assert_equal(membership.tolist(),
+                     [[True, False], [False, True], [False, True]])
+        # once per topology for the state, and again for its negation
+        assert_equal(sorted(map(tuple, state.calls)),
+                     [('A', 'A'), ('A', 'A'), ('B',), ('B',)])
+
     def test_from_individual_runs(self):
         runs = [(self.snap0, self.left),
                 (self.snap0, self.left),
@@ -242,6 +304,18 @@ class TestShootingPointAnalysis(object):
             assert_true(hist[index] > 0)
         assert_array_almost_equal(bins, input_bins)
 
+    def test_committor_histogram_int_bins(self):
+        rehash = lambda snap: 2 * snap.xyz[0][0]
+        hist, bins = self.analyzer.committor_histogram(rehash, self.left,
+                                                       bins=2)
+        # the largest key is on the last bin edge; it must be included
+        assert_array_almost_equal(bins, [0.0, 0.1, 0.2])
+        assert_equal(len(hist), 2)
+        committor = self.analyzer.committor(self.left)
+        for (snap, value) in committor.items():
+            index = 0 if rehash(snap) < 0.1 else 1
+            assert_almost_equal(hist[index], value)
+
     def test_committor_histogram_2d(self):
         rehash = lambda snap: (snap.xyz[0][0], 2 * snap.xyz[0][0])
         input_bins = [-0.05, 0.05, 0.15, 0.25, 0.35, 0.45]
@@ -275,3 +349,7 @@ class TestShootingPointAnalysis(object):
         assert_items_equal(df1.index, list(range(2)))
         assert_same_items(df2.index, [0.0, 0.1])
         assert_same_items(df1.columns, [self.left.name, self.right.name])
+        assert_equal(list(df1.sum(axis=1)), [20, 20])
+        snap0_row = df2.loc[0.0]
+        assert_equal(snap0_row[self.left.name],
+                     self.analyzer[self.snap0][self.left])
@@ -100,6 +100,22 @@ class TestCVDefinedVolume(object):
         assert_equal(volA(-0.50), True)
         assert_equal(volA(-0.51), False)
 
+    def test_contains_all(self):
+        values = [-0.6, -0.5, 0.0, 0.3, 0.5, 0.8]
+        for vol in [volA, ~volA, volA | volB, volA & volB, volA - volB,
+                    volA ^ volB, volA | volA2]:
+            assert_equal(vol.contains_all(values).tolist(),
+                         [vol(val) for val in values])
+
+    def test_contains_all_cv(self):
+        traj = make_1d_traj([-0.6, -0.5, 0.0, 0.3, 0.5, 0.8])
+        cv = paths.FunctionCV("x", lambda s: s.xyz[0][0])
+        vol = volume.CVDefinedVolume(cv, -0.5, 0.5)
+        periodic = volume.PeriodicCVDefinedVolume(cv, 0.4, -0.4, -1.0, 1.0)
+        for v in [vol, ~vol, periodic]:
+            assert_equal(v.contains_all(traj).tolist(),
+                         [v(snap) for snap in traj])
+
     def test_negation(self):
         assert_equal((~volA)(0.25), False)
         assert_equal((~volA)(0.75), True)
@@ -6,7 +6,7 @@ Created on 03.09.2014
 
 from . import range_logic
 import abc
-from openpathsampling.netcdfplus import StorableNamedObject
+from openpathsampling.netcdfplus import StorableNamedObject, PseudoAttribute
 import numpy as np
 import warnings
 
@@ -60,6 +60,25 @@ class Volume(StorableNamedObject):
         '''
         return False # pragma: no cover
 
+    def contains_all(self, snapshots):
+        """Whether each of several snapshots is part of the volume.
+
+        This default calls the volume once per snapshot. Subclasses that
+        can test many snapshots together (e.g., with one CV evaluation)
+        override it.
+
+        Parameters
+        ----------
+        snapshots : list of :class:`.Snapshot`
+            the snapshots to test
+
+        Returns
+        -------
+        np.array of bool
+            for each snapshot, whether it is in the volume
+        """
+        return np.array([bool(self(snap)) for snap in snapshots], dtype=bool)
+
     def __str__(self):
         '''
         Returns a string representation of the volume
@@ -145,6 +164,15 @@ class VolumeCombination(Volume):
         #return self.fnc(self.volume1.__call__(snapshot),
                         #self.volume2.__call__(snapshot))
 
+    def contains_all(self, snapshots):
+        # both volumes are tested for every snapshot (no short circuit), so
+        # that each can test all the snapshots together
+        in_volume1 = self.volume1.contains_all(snapshots)
+        in_volume2 = self.volume2.contains_all(snapshots)
+        return np.array([bool(self.fnc(a, b))
+                         for (a, b) in zip(in_volume1, in_volume2)],
+                        dtype=bool)
+
     def __str__(self):
         return '(' + self.sfnc.format(str(self.volume1), str(self.volume2)) + ')'
 
@@ -205,6 +233,9 @@ class NegatedVolume(Volume):
     def __call__(self, snapshot):
         return not self.volume(snapshot)
 
+    def contains_all(self, snapshots):
+        return ~self.volume.contains_all(snapshots)
+
     def __str__(self):
         return '(not ' + str(self.volume) + ')'
 
@@ -415,14 +446,28 @@ class CVDefinedVolume(Volume):
             return True
 
     def _get_cv_float(self, snapshot):
-        val = self.collectivevariable(snapshot)
+        return self._cv_value_to_float(self.collectivevariable(snapshot))
+
+    def _cv_value_to_float(self, val):
         if self._cv_returns_iterable is None:
             self._cv_returns_iterable = self._is_iterable(val)
         return val.__float__()
 
     def __call__(self, snapshot):
-        l = self._get_cv_float(snapshot)
-
+        return self._contains_value(self._get_cv_float(snapshot))
+
+    def contains_all(self, snapshots):
+        cv = self.collectivevariable
+        if not isinstance(cv, PseudoAttribute):
+            # a plain callable only takes one snapshot at a time
+            return super(CVDefinedVolume, self).contains_all(snapshots)
+        # one CV call for all snapshots (e.g., a single MDTraj call)
+        values = cv(list(snapshots))
+        return np.array([self._contains_value(self._cv_value_to_float(val))
+                         for val in values], dtype=bool)
+
+    def _contains_value(self, l):
+        """Whether the CV value `l` is in the range of this volume"""
         # we explicitly test for infinity to allow the user to
         # define `lambda_min/max='inf'` also when using units
         # a simtk unit cannot be compared to a python infinite float
@@ -477,6 +522,9 @@ class PeriodicCVDefinedVolume(CVDefinedVolume):
                 class MonkeyPatch(type(self)):
                     def __call__(self, *arg, **kwarg):
                         return True
+
+                    def contains_all(self, snapshots):
+                        return np.ones(len(snapshots), dtype=bool)
                 self.__class__ = MonkeyPatch
             else:
                 self.lambda_min = self.do_wrap(lambda_min)
@@ -530,8 +578,7 @@ class PeriodicCVDefinedVolume(CVDefinedVolume):
                                     self.period_min, self.period_max
                                    )
 
-    def __call__(self, snapshot):
-        l = self._get_cv_float(snapshot)
+    def _contains_value(self, l):
         if self.wrap:
             l = self.do_wrap(l)
         if self.lambda_min > self.lambda_max: